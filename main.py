@@ -16,6 +16,15 @@ from datetime import datetime
 sys.path.insert(0, str(Path(__file__).parent))
 
 from src.deepcodeagent.workflow import workflowfun
+from src.tools.search import close_http_session
+
+
+async def run_and_close(coro):
+    """运行入口协程，并在事件循环结束前关闭共享的 HTTP 会话"""
+    try:
+        return await coro
+    finally:
+        await close_http_session()
 
 
 async def run_single_task(requirement: str, output_dir: str = None):
@@ -294,20 +303,20 @@ def main():
     # 运行模式判断
     if args.test:
         # 测试模式
-        asyncio.run(test_full_workflow())
+        asyncio.run(run_and_close(test_full_workflow()))
     elif args.interactive:
         # 交互式模式
-        asyncio.run(interactive_mode())
+        asyncio.run(run_and_close(interactive_mode()))
     elif args.file:
         # 批处理模式
-        asyncio.run(batch_mode(args.file, args.output))
+        asyncio.run(run_and_close(batch_mode(args.file, args.output)))
     elif args.requirement:
         # 单任务模式
-        asyncio.run(run_single_task(args.requirement, args.output))
+        asyncio.run(run_and_close(run_single_task(args.requirement, args.output)))
     else:
         # 默认进入交互式模式
         print("未指定任务，进入交互式模式...")
-        asyncio.run(interactive_mode())
+        asyncio.run(run_and_close(interactive_mode()))
 
 
 if __name__ == "__main__":
@@ -95,6 +95,8 @@ You are coordinating a coding team to implement an architecture document.
                     async def tool_handler(**arguments):
                         try:
                             if hasattr(t_instance, 'execute'):
+                                if hasattr(t_instance, 'validate_args'):
+                                    t_instance.validate_args(arguments)
                                 if asyncio.iscoroutinefunction(t_instance.execute):
                                     result = await t_instance.execute(**arguments)
                                 else:
@@ -284,6 +286,8 @@ You have access to file system tools to read, write, and edit code files.
                     async def tool_handler(**arguments):
                         try:
                             if hasattr(t_instance, 'execute'):
+                                if hasattr(t_instance, 'validate_args'):
+                                    t_instance.validate_args(arguments)
                                 if asyncio.iscoroutinefunction(t_instance.execute):
                                     result = await t_instance.execute(**arguments)
                                 else:
@@ -514,6 +518,8 @@ You are responsible for ensuring code quality through comprehensive testing.
                     async def tool_handler(**arguments):
                         try:
                             if hasattr(t_instance, 'execute'):
+                                if hasattr(t_instance, 'validate_args'):
+                                    t_instance.validate_args(arguments)
                                 if asyncio.iscoroutinefunction(t_instance.execute):
                                     result = await t_instance.execute(**arguments)
                                 else:
@@ -779,6 +785,8 @@ Provide actionable insights and specific improvement recommendations.
                     async def tool_handler(**arguments):
                         try:
                             if hasattr(t_instance, 'execute'):
+                                if hasattr(t_instance, 'validate_args'):
+                                    t_instance.validate_args(arguments)
                                 if asyncio.iscoroutinefunction(t_instance.execute):
                                     result = await t_instance.execute(**arguments)
                                 else:
@@ -102,10 +102,12 @@ Must return structured JSON decision using the make_decision tool.
                     async def tool_handler(**arguments):
                         try:
                             if hasattr(t_instance, 'execute'):
-                                if asyncio.iscoroutinefunction(tool_instance.execute):
-                                    result = await tool_instance.execute(**arguments)
+                                if hasattr(t_instance, 'validate_args'):
+                                    t_instance.validate_args(arguments)
+                                if asyncio.iscoroutinefunction(t_instance.execute):
+                                    result = await t_instance.execute(**arguments)
                                 else:
-                                    result = tool_instance.execute(**arguments)
+                                    result = t_instance.execute(**arguments)
                                 return result
                             return {"success": True, "message": f"Tool {t_name} executed"}
                         except Exception as e:
@@ -3,6 +3,7 @@
 Phase 2: Searching - 生成查询，搜索信息，总结结果
 """
 
+import asyncio
 import json
 import logging
 from typing import List, Dict, Any
@@ -44,11 +45,14 @@ class SearchingPhase(BasePhase):
         else:
             queries = search_queries
 
-        # 执行搜索
-        search_results = []
-        for query in queries[:3]:  # 限制搜索次数
+        # 执行搜索（并发发起，按查询顺序收集结果）
+        queries = queries[:3]  # 限制搜索次数
+        for query in queries:
             logger.info(f"Searching for: {query}")
-            result = await self._perform_search(query)
+        results = await asyncio.gather(*(self._perform_search(query) for query in queries))
+
+        search_results = []
+        for query, result in zip(queries, results):
             search_results.append({
                 "query": query,
                 "result": result
@@ -54,6 +54,8 @@ def register_tools_by_agent_name(agent: MyAgent, agent_name: str) -> None:
                     async def tool_handler(**arguments):
                         try:
                             if hasattr(t_instance, 'execute'):
+                                if hasattr(t_instance, 'validate_args'):
+                                    t_instance.validate_args(arguments)
                                 if asyncio.iscoroutinefunction(t_instance.execute):
                                     result = await t_instance.execute(**arguments)
                                 else:
@@ -4,7 +4,6 @@ Agent 核心实现
 """
 
 import asyncio
-import json
 import uuid
 from typing import Any, Callable, Dict, List, Optional, AsyncIterator, Tuple
 from dataclasses import dataclass, field
@@ -15,6 +14,7 @@ from src.mcp.mcp_manager import MCPManager
 from .models import Message, ToolDefinition, ToolResult, AgentInfo
 from src.myllms.base import BaseModel, ChatResponse
 from src.hooks import HookEvent, HookContext, Hook, HookRegistry, hook
+from src.tools.json_utils import dumps as json_dumps, loads as json_loads
 
 logger = logging.getLogger(__name__)
 
@@ -41,7 +41,7 @@ def limit_tool_result(data: Any, max_chars: int = 50000) -> Any:
         return data
 
     # 将数据转换为JSON字符串查看长度
-    json_str = json.dumps(data, ensure_ascii=False, indent=2)
+    json_str = json_dumps(data, indent=True)
 
     # 如果不超过限制，直接返回
     if len(json_str) <= max_chars:
@@ -53,7 +53,7 @@ def limit_tool_result(data: Any, max_chars: int = 50000) -> Any:
         result = []
         current_chars = len('[\n')
         for i, item in enumerate(data):
-            item_str = json.dumps(item, ensure_ascii=False)
+            item_str = json_dumps(item)
             if current_chars + len(item_str) + 10 > max_chars:  # 10是缓冲
                 break
             result.append(item)
@@ -72,7 +72,7 @@ def limit_tool_result(data: Any, max_chars: int = 50000) -> Any:
         result = {}
         current_chars = len('{\n')
         for key, value in data.items():
-            item_str = json.dumps({key: value}, ensure_ascii=False)[2:-2]  # 去掉外层的{}
+            item_str = json_dumps({key: value})[2:-2]  # 去掉外层的{}
             if current_chars + len(f'"{key}": {item_str},\n') + 10 > max_chars:
                 break
             result[key] = value
@@ -91,7 +91,7 @@ def limit_tool_result(data: Any, max_chars: int = 50000) -> Any:
         if isinstance(data, str):
             return data[:max_chars] + "...[内容已截断]"
         else:
-            json_str = json.dumps(data, ensure_ascii=False)
+            json_str = json_dumps(data)
             return json_str[:max_chars] + "...[内容已截断]"
 
 
@@ -625,11 +625,7 @@ class MyAgent:
                     # 添加工具结果消息
                     tool_msg = Message(
                         role="tool",
-                        content=json.dumps(
-                            result.data,
-                            ensure_ascii=False,
-                            indent=2
-                        ),
+                        content=json_dumps(result.data, indent=True),
                         tool_call_id=tool_call_id
                     )
 
@@ -693,9 +689,9 @@ class MyAgent:
                     # 如果 arguments 是字符串，尝试解析为 JSON
                     if isinstance(arguments, str):
                         try:
-                            arguments = json.loads(arguments)
+                            arguments = json_loads(arguments)
                             logger.debug(f"Parsed arguments from JSON: {arguments}")
-                        except json.JSONDecodeError as e:
+                        except ValueError as e:
                             logger.error(f"Failed to parse arguments as JSON: {e}")
                             continue
 
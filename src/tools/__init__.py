@@ -17,7 +17,7 @@ from .decorators import (
 )
 
 # Import search functionality
-from .search import get_web_search_tool
+from .search import get_web_search_tool, get_cached_web_search_tool
 # Temporarily disable crawl due to missing dependency
 # from .crawl import crawl
 from .sandbox import PythonSandbox
@@ -201,6 +201,7 @@ __all__ = [
     "create_logged_tool",
     # Search functionality
     "get_web_search_tool",
+    "get_cached_web_search_tool",
     # "crawl",  # Temporarily disabled
     "MyRagSearchTool",
     "PythonSandbox",
@@ -5,10 +5,18 @@ import logging
 from abc import ABC, abstractmethod
 from typing import Any, Callable, Dict, List, Optional, Type, TypeVar, Union
 
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+
 logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
 
+# 每个工具类编译一次的参数校验器
+_ARG_VALIDATORS: Dict[type, Optional[Callable[[Dict[str, Any]], Any]]] = {}
+
 
 def log_io(func: Callable) -> Callable:
     """
@@ -21,15 +29,29 @@ def log_io(func: Callable) -> Callable:
         The wrapped function with input/output logging
     """
 
-    @functools.wraps(func)
-    def wrapper(*args: Any, **kwargs: Any) -> Any:
-        # Log input parameters
-        func_name = func.__name__
+    func_name = func.__name__
+
+    def _log_call(args: tuple, kwargs: dict) -> None:
         params = ", ".join(
             [*(str(arg) for arg in args), *(f"{k}={v}" for k, v in kwargs.items())]
         )
         logger.info(f"Tool {func_name} called with parameters: {params}")
 
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            _log_call(args, kwargs)
+            result = await func(*args, **kwargs)
+            logger.info(f"Tool {func_name} returned: {result}")
+            return result
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        # Log input parameters
+        _log_call(args, kwargs)
+
         # Execute the function
         result = func(*args, **kwargs)
 
@@ -132,6 +154,34 @@ class BaseTool(ABC):
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(None, self._run, *args, **kwargs)
 
+    def validate_args(self, arguments: Dict[str, Any]) -> None:
+        """
+        按 get_schema() 中的参数 Schema 校验工具调用参数。
+
+        校验器由 fastjsonschema 生成，每个工具类只编译一次；
+        未安装 fastjsonschema 或工具没有 get_schema 时不做校验。
+
+        Args:
+            arguments: 工具调用参数
+
+        Raises:
+            ValueError: 参数不符合 Schema（fastjsonschema.JsonSchemaException）
+        """
+        cls = type(self)
+        if cls not in _ARG_VALIDATORS:
+            validator = None
+            get_schema = getattr(self, "get_schema", None)
+            if fastjsonschema is not None and get_schema is not None:
+                parameters = get_schema().get("function", {}).get("parameters")
+                if parameters:
+                    # 只校验，不把 Schema 中的 default 写回调用方的参数
+                    validator = fastjsonschema.compile(parameters, use_default=False)
+            _ARG_VALIDATORS[cls] = validator
+
+        validator = _ARG_VALIDATORS[cls]
+        if validator is not None:
+            validator(arguments)
+
     def get_tool_definition(self) -> Dict[str, Any]:
         """
         获取工具定义（JSON Schema 格式）
@@ -3,11 +3,124 @@ File manipulation tools for agents
 """
 
 import os
+import ast
 import json
-from typing import Any, Dict, Optional, List
+import re
+import asyncio
+import fnmatch
+import functools
+from collections import deque
+from typing import Any, Dict, Optional, List, Tuple
 from pathlib import Path
 
 
+# Classifies a stripped line in a single match: import statement, or a
+# comment/docstring line that may precede the imports
+_IMPORT_HEADER_RE = re.compile(r"(?P<imp>import |from )|#|\"\"\"|'''")
+
+
+def _import_keys(nodes: List[ast.stmt]) -> set:
+    """Normalize import nodes to (kind, module, name, alias) tuples"""
+    keys = set()
+    for node in nodes:
+        if isinstance(node, ast.Import):
+            keys.update(("import", None, alias.name, alias.asname) for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            module = "." * node.level + (node.module or "")
+            keys.update(("from", module, alias.name, alias.asname) for alias in node.names)
+    return keys
+
+
+def _parse_import_keys(source: str) -> Optional[set]:
+    """Parse an import statement; None if it is not valid import syntax"""
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return None
+    return _import_keys(tree.body) or None
+
+
+@functools.lru_cache(maxsize=4096)
+def _ensure_dir(dir_path: str) -> None:
+    """Create dir_path once; repeated writes into the same directory hit the cache"""
+    os.makedirs(dir_path, exist_ok=True)
+
+
+def _write_bytes(path: str, data: bytes, fsync: bool = False) -> None:
+    """Write pre-encoded data straight to a file descriptor, bypassing the io layer"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        written = os.write(fd, data)
+        if written < len(data):
+            # Large payloads may be written partially
+            view = memoryview(data)[written:]
+            while view:
+                view = view[os.write(fd, view):]
+        if fsync:
+            os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class _GroupCommitWriter:
+    """Coalesces durable writes that arrive close together into one fsync batch
+
+    Callers enqueue encoded content and await their future. A drain task,
+    started lazily on the running loop, waits a short window, then writes
+    and fsyncs the whole batch in a single executor hop. Repeated writes to
+    the same path within a batch collapse to the last one.
+    """
+
+    def __init__(self, window: float = 0.002, max_batch: int = 64):
+        self._window = window
+        self._max_batch = max_batch
+        self._pending: deque = deque()
+        self._task: Optional[asyncio.Task] = None
+
+    async def submit(self, filepath: str, data: bytes) -> None:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((filepath, data, future))
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._task = loop.create_task(self._drain())
+        await future
+
+    async def _drain(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            await asyncio.sleep(self._window)
+            batch = [self._pending.popleft() for _ in range(min(len(self._pending), self._max_batch))]
+            errors = await loop.run_in_executor(
+                None, self._write_batch, [(path, data) for path, data, _ in batch]
+            )
+            for (path, _, future), error in zip(batch, errors):
+                if future.done():
+                    continue
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(None)
+
+    @staticmethod
+    def _write_batch(batch: List[Tuple[str, bytes]]) -> List[Optional[Exception]]:
+        """Write each path's latest content and fsync it once"""
+        latest: Dict[str, bytes] = {}
+        for path, data in batch:
+            latest[path] = data
+
+        path_errors: Dict[str, Optional[Exception]] = {}
+        for path, data in latest.items():
+            try:
+                _write_bytes(path, data, fsync=True)
+                path_errors[path] = None
+            except Exception as e:
+                path_errors[path] = e
+        return [path_errors[path] for path, _ in batch]
+
+
+_group_commit_writer = _GroupCommitWriter()
+
+
 class WriteFileTool:
     """Tool for writing content to files"""
 
@@ -37,6 +150,11 @@ class WriteFileTool:
                             "type": "string",
                             "description": "File encoding (default: utf-8)",
                             "default": "utf-8"
+                        },
+                        "sync": {
+                            "type": "boolean",
+                            "description": "Flush the file to disk before returning (default: false)",
+                            "default": False
                         }
                     },
                     "required": ["filepath", "content"]
@@ -45,17 +163,33 @@ class WriteFileTool:
         }
 
     @staticmethod
-    async def execute(filepath: str, content: str, encoding: str = "utf-8") -> Dict[str, Any]:
+    async def execute(filepath: str, content: str, encoding: str = "utf-8", sync: bool = False) -> Dict[str, Any]:
         """Execute the tool"""
         try:
             # Create directory if it doesn't exist
             dir_path = os.path.dirname(filepath)
             if dir_path:  # Only create if there's a directory path
-                os.makedirs(dir_path, exist_ok=True)
+                _ensure_dir(dir_path)
 
             # Write file
-            with open(filepath, "w", encoding=encoding) as f:
-                f.write(content)
+            data = content.encode(encoding)
+
+            async def write() -> None:
+                if sync:
+                    # Durable writes are group-committed with concurrent callers
+                    await _group_commit_writer.submit(filepath, data)
+                else:
+                    loop = asyncio.get_running_loop()
+                    await loop.run_in_executor(None, _write_bytes, filepath, data)
+
+            try:
+                await write()
+            except FileNotFoundError:
+                if not dir_path:
+                    raise
+                # The cached directory was removed since it was created
+                os.makedirs(dir_path, exist_ok=True)
+                await write()
 
             return {
                 "success": True,
@@ -173,9 +307,25 @@ class EditFileTool:
             with open(filepath, "r", encoding=encoding) as f:
                 content = f.read()
 
-            # Replace content
-            if old_content in content:
+            if not old_content:
+                return {
+                    "success": False,
+                    "error": "Old content must not be empty",
+                    "filepath": filepath
+                }
+
+            delta = len(old_content) - len(new_content)
+            if delta:
+                # One replace scan; the count falls out of the length change
                 new_file_content = content.replace(old_content, new_content)
+                replacements = (len(content) - len(new_file_content)) // delta
+            else:
+                # Equal lengths: split once to find, count and replace together
+                parts = content.split(old_content)
+                replacements = len(parts) - 1
+                new_file_content = new_content.join(parts)
+
+            if replacements:
 
                 # Write back
                 with open(filepath, "w", encoding=encoding) as f:
@@ -185,7 +335,7 @@ class EditFileTool:
                     "success": True,
                     "message": f"Successfully replaced content in {filepath}",
                     "filepath": filepath,
-                    "replacements": content.count(old_content)
+                    "replacements": replacements
                 }
             else:
                 return {
@@ -243,27 +393,44 @@ class ListFilesTool:
         """Execute the tool"""
         try:
             path_obj = Path(path)
-
-            if recursive:
-                if pattern:
-                    files = list(path_obj.rglob(pattern))
-                else:
-                    files = list(path_obj.rglob("*"))
-            else:
-                if pattern:
-                    files = list(path_obj.glob(pattern))
-                else:
-                    files = list(path_obj.iterdir())
-
-            # Separate files and directories
             file_list = []
             dir_list = []
 
-            for item in files:
-                if item.is_file():
-                    file_list.append(str(item))
-                elif item.is_dir():
-                    dir_list.append(str(item))
+            if pattern and ("/" in pattern or os.sep in pattern):
+                # Path-style patterns need pathlib's glob semantics
+                files = path_obj.rglob(pattern) if recursive else path_obj.glob(pattern)
+                for item in files:
+                    if item.is_file():
+                        file_list.append(str(item))
+                    elif item.is_dir():
+                        dir_list.append(str(item))
+            else:
+                # Report paths the way str(Path(path) / name) does: the root in
+                # pathlib's normal form and no leading "./" under the current directory
+                root = str(path_obj)
+                strip = len(os.curdir + os.sep) if root == os.curdir else 0
+                if recursive:
+                    # os.walk classifies entries from the cached d_type
+                    for dirpath, dirnames, filenames in os.walk(root):
+                        prefix = os.path.join(dirpath, "")[strip:]
+                        if pattern:
+                            dirnames_matched = fnmatch.filter(dirnames, pattern)
+                            filenames = fnmatch.filter(filenames, pattern)
+                        else:
+                            dirnames_matched = dirnames
+                        dir_list.extend(prefix + d for d in dirnames_matched)
+                        file_list.extend(prefix + f for f in filenames)
+                else:
+                    prefix = os.path.join(root, "")[strip:]
+                    # DirEntry caches the entry type, so no extra stat per item
+                    with os.scandir(root) as entries:
+                        for entry in entries:
+                            if pattern and not fnmatch.fnmatch(entry.name, pattern):
+                                continue
+                            if entry.is_file():
+                                file_list.append(prefix + entry.name)
+                            elif entry.is_dir():
+                                dir_list.append(prefix + entry.name)
 
             return {
                 "success": True,
@@ -340,19 +507,51 @@ class AddImportsTool:
 
             for i, line in enumerate(lines):
                 stripped = line.strip()
+                match = _IMPORT_HEADER_RE.match(stripped)
                 # Check for import statements
-                if stripped.startswith(('import ', 'from ')):
+                if match and match.group("imp"):
                     import_lines.add(stripped)
                     import_end_idx = i + 1
-                elif stripped and not stripped.startswith('#') and not stripped.startswith('"""') and not stripped.startswith("'''"):
+                elif stripped and not match:
                     # Stop at first non-import, non-comment line
                     break
 
+            # Compare structurally so spacing, comments and aliases don't matter
+            try:
+                tree = ast.parse("".join(lines))
+            except SyntaxError:
+                tree = None
+
+            if tree is not None:
+                existing_keys = _import_keys(tree.body)
+                # The AST knows where multi-line imports actually end
+                header_end = 0
+                for idx, node in enumerate(tree.body):
+                    if isinstance(node, (ast.Import, ast.ImportFrom)):
+                        header_end = node.end_lineno
+                    elif not (idx == 0 and isinstance(node, ast.Expr)
+                              and isinstance(node.value, ast.Constant)
+                              and isinstance(node.value.value, str)):
+                        break
+                if header_end:
+                    import_end_idx = header_end
+            else:
+                existing_keys = set()
+                for line in import_lines:
+                    existing_keys |= _parse_import_keys(line) or set()
+
             # Filter out already existing imports
             new_imports = []
             for imp in imports:
-                if imp.strip() not in import_lines:
-                    new_imports.append(imp.strip())
+                stripped = imp.strip()
+                keys = _parse_import_keys(stripped)
+                if keys is None:
+                    if stripped not in import_lines:
+                        import_lines.add(stripped)
+                        new_imports.append(stripped)
+                elif not keys <= existing_keys:
+                    existing_keys |= keys
+                    new_imports.append(stripped)
 
             if not new_imports:
                 return {
@@ -0,0 +1,15 @@
+"""
+ID helpers for tools
+"""
+
+import os
+
+
+def new_id() -> str:
+    """
+    Return an opaque 128-bit random ID as 32 hex characters
+
+    Read from os.urandom on every call, so forked processes don't repeat each
+    other's IDs, and cheaper than building a UUID object.
+    """
+    return os.urandom(16).hex()
@@ -0,0 +1,72 @@
+"""
+JSON helpers for tools
+
+Uses orjson when it is installed and falls back to the standard library.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(obj: Any, indent: bool = False) -> str:
+    """
+    Serialize obj to a JSON string
+
+    Args:
+        obj: Object to serialize
+        indent: Pretty-print with two-space indentation (compact otherwise)
+
+    Returns:
+        JSON string
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+        except TypeError:
+            # Non-str keys, big ints etc. that only the stdlib encoder accepts
+            pass
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+    # Compact like orjson, so the text doesn't depend on whether orjson is installed
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def dumps_bytes(obj: Any, indent: bool = False) -> bytes:
+    """
+    Serialize obj to UTF-8 encoded JSON, e.g. for HTTP request bodies or files
+
+    Args:
+        obj: Object to serialize
+        indent: Pretty-print with two-space indentation (compact otherwise)
+
+    Returns:
+        JSON bytes
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+        except TypeError:
+            pass
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: Any) -> Any:
+    """
+    Deserialize a JSON str/bytes document
+
+    Args:
+        data: JSON document
+
+    Returns:
+        Parsed object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -4,15 +4,10 @@
 
 import asyncio
 import logging
-from typing import Any, Dict
+import threading
+from typing import Any, Dict, Optional
 
-
-
-from src.rag.jsonkvDB import JsonKVStorage
-from src.rag.modalprocessors import ContextExtractor
-from src.rag.qdrant import QdrantRetriever
 from src.tools.decorators import BaseTool, tool, log_io
-from src.rag.myRag import MyRag
 
 logger = logging.getLogger(__name__)
 
@@ -43,11 +38,30 @@ class MyRagSearchTool(BaseTool):
         }
     }
 
-    def __init__(self):
-        self.rag = MyRag(ContextExtractor, QdrantRetriever(), JsonKVStorage())
+    # 所有工具实例共享一个 MyRag（及其 Qdrant 客户端），首次搜索时才创建
+    _shared_rag: Optional[Any] = None
+    _rag_lock = threading.Lock()
+
+    @classmethod
+    def _get_rag(cls) -> Any:
+        """获取共享的 MyRag 实例，按需导入 RAG 依赖"""
+        if cls._shared_rag is None:
+            with cls._rag_lock:
+                if cls._shared_rag is None:
+                    from src.rag.jsonkvDB import JsonKVStorage
+                    from src.rag.modalprocessors import ContextExtractor
+                    from src.rag.qdrant import QdrantRetriever
+                    from src.rag.myRag import MyRag
+
+                    cls._shared_rag = MyRag(ContextExtractor, QdrantRetriever(), JsonKVStorage())
+        return cls._shared_rag
+
+    @property
+    def rag(self) -> Any:
+        return self._get_rag()
 
     @log_io
-    def execute(
+    async def execute(
         self,
         query: str,
         top_k: int = 5,
@@ -56,6 +70,8 @@ class MyRagSearchTool(BaseTool):
         """
         执行 MyRag 搜索
 
+        在调用方的事件循环中运行，可通过 asyncio.gather 并发多个查询。
+
         Args:
             query: 搜索查询
             top_k: 返回结果数量
@@ -66,19 +82,16 @@ class MyRagSearchTool(BaseTool):
         """
         try:
             # 执行异步搜索
-            loop = asyncio.new_event_loop()
-            results = loop.run_until_complete(
-                self.rag.aquery(query)
-            )
-            loop.close()
+            results = await self.rag.aquery(query)
 
             # 格式化结果
             formatted_results = []
-            for i, result in enumerate(results[:top_k]):
+            for i, result in enumerate(results[:top_k], 1):
+                length = len(result)
                 formatted_results.append({
-                    "index": i + 1,
-                    "content": result[:500] + "..." if len(result) > 500 else result,
-                    "length": len(result)
+                    "index": i,
+                    "content": result if length <= 500 else result[:500] + "...",
+                    "length": length
                 })
 
             return {
@@ -97,6 +110,26 @@ class MyRagSearchTool(BaseTool):
                 "query": query
             }
 
+    def execute_sync(self, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        """
+        同步调用入口，仅在当前线程没有运行中的事件循环时使用
+
+        Raises:
+            RuntimeError: 在事件循环内调用时，应改为 await execute()
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.execute(*args, **kwargs))
+        raise RuntimeError("execute_sync() cannot be called from a running event loop; await execute() instead")
+
+    def _run(self, *args: Any, **kwargs: Any) -> Any:
+        """同步执行方法，委托给 execute_sync"""
+        return self.execute_sync(*args, **kwargs)
+
+    async def _arun(self, *args: Any, **kwargs: Any) -> Any:
+        """异步执行方法，直接在当前事件循环中 await execute"""
+        return await self.execute(*args, **kwargs)
 
 
 # 导出所有工具
@@ -0,0 +1,97 @@
+"""
+搜索后端限流
+
+令牌桶限制请求速率（有余量时不等待），信号量限制同时在途的请求数，
+避免并发搜索触发后端 API 的 429。
+"""
+
+import asyncio
+import time
+from typing import Dict, Optional, Tuple
+
+
+class TokenBucket:
+    """
+    令牌桶
+
+    Args:
+        rate: 每秒补充的令牌数
+        capacity: 桶容量（允许的突发请求数）
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    async def acquire(self) -> None:
+        """取一个令牌；令牌不足时只等待补足所需的时间，等待者按到达顺序放行"""
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+
+class BackendLimiter:
+    """
+    单个后端的限流器：并发上限 + 令牌桶
+
+    用法:
+        async with limiter:
+            ...  # 发起请求
+    """
+
+    def __init__(self, rate: float, burst: float, max_concurrency: int):
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._bucket = TokenBucket(rate, burst)
+
+    async def __aenter__(self) -> "BackendLimiter":
+        await self._semaphore.acquire()
+        try:
+            await self._bucket.acquire()
+        except BaseException:
+            self._semaphore.release()
+            raise
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self._semaphore.release()
+
+
+# {后端名: (所属事件循环, 限流器)}；asyncio 原语绑定事件循环，循环变化时重建
+_limiters: Dict[str, Tuple[asyncio.AbstractEventLoop, BackendLimiter]] = {}
+
+
+def get_backend_limiter(
+    backend: str,
+    rate: float,
+    burst: float,
+    max_concurrency: int,
+) -> BackendLimiter:
+    """
+    获取后端共享的限流器（同一事件循环内同名后端共用一个）
+
+    Args:
+        backend: 后端名称
+        rate: 每秒请求数
+        burst: 允许的突发请求数
+        max_concurrency: 最大并发请求数
+
+    Returns:
+        BackendLimiter
+    """
+    loop = asyncio.get_running_loop()
+    entry: Optional[Tuple[asyncio.AbstractEventLoop, BackendLimiter]] = _limiters.get(backend)
+    if entry is None or entry[0] is not loop:
+        entry = (loop, BackendLimiter(rate, burst, max_concurrency))
+        _limiters[backend] = entry
+    return entry[1]
@@ -2,11 +2,21 @@
 Reporting and documentation tools
 """
 
-import json
-import uuid
+import io
+import re
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 from src.tools import BaseTool
+from src.tools.ids import new_id
+from src.tools.json_utils import dumps as json_dumps
+
+
+_POSITIVE_WORDS = frozenset({"good", "great", "excellent", "success", "achieved", "completed"})
+_NEGATIVE_WORDS = frozenset({"bad", "failed", "issue", "problem", "challenge", "difficult"})
+# One alternation over every sentiment word keeps the scan inside the regex engine
+_SENTIMENT_RE = re.compile(
+    r"\b(?:" + "|".join(map(re.escape, sorted(_POSITIVE_WORDS | _NEGATIVE_WORDS))) + r")\b"
+)
 
 
 class ReportGeneratorTool(BaseTool):
@@ -35,16 +45,17 @@ class ReportGeneratorTool(BaseTool):
                 format: str = "markdown",
                 include_charts: bool = False) -> Dict[str, Any]:
         """Generate report"""
-        report_id = str(uuid.uuid4())
+        report_id = new_id()
+        now = datetime.now()
 
         report = {
             "id": report_id,
             "type": report_type,
             "format": format,
-            "generated_at": datetime.now().isoformat(),
+            "generated_at": now.isoformat(),
             "data": data,
             "include_charts": include_charts,
-            "content": self._generate_report_content(report_type, data, format)
+            "content": self._generate_report_content(report_type, data, format, now=now)
         }
 
         return {
@@ -53,38 +64,39 @@ class ReportGeneratorTool(BaseTool):
             "message": f"Generated {report_type} report in {format} format"
         }
 
-    def _generate_report_content(self, report_type: str, data: Dict, format: str) -> str:
+    def _generate_report_content(self, report_type: str, data: Dict, format: str,
+                                 now: Optional[datetime] = None) -> str:
         """Generate report content based on type and format"""
         if format == "markdown":
-            return self._generate_markdown_report(report_type, data)
+            return self._generate_markdown_report(report_type, data, now=now)
         elif format == "json":
-            return json.dumps(data, indent=2)
+            return json_dumps(data, indent=True)
         else:
             return "Report content (HTML would go here)"
 
-    def _generate_markdown_report(self, report_type: str, data: Dict) -> str:
+    def _generate_markdown_report(self, report_type: str, data: Dict,
+                                  now: Optional[datetime] = None) -> str:
         """Generate markdown report"""
-        content = [f"# {report_type.title()} Report", ""]
-        content.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        content.append("")
+        now = now or datetime.now()
+        buf = io.StringIO()
+        buf.write(f"# {report_type.title()} Report\n\n")
+        buf.write(f"Generated: {now:%Y-%m-%d %H:%M:%S}\n")
 
-        # Add key sections based on report type
+        # Add key sections based on report type, each after a blank line
         if report_type == "progress":
-            content.extend([
-                "## Progress Summary",
-                "- Total Tasks: " + str(data.get("total_tasks", 0)),
-                "- Completed: " + str(data.get("completed", 0)),
-                "- In Progress: " + str(data.get("in_progress", 0)),
-                ""
-            ])
+            buf.write("\n## Progress Summary\n- Total Tasks: ")
+            buf.write(str(data.get("total_tasks", 0)))
+            buf.write("\n- Completed: ")
+            buf.write(str(data.get("completed", 0)))
+            buf.write("\n- In Progress: ")
+            buf.write(str(data.get("in_progress", 0)))
+            buf.write("\n")
         elif report_type == "summary":
-            content.extend([
-                "## Executive Summary",
-                data.get("summary", "No summary provided"),
-                ""
-            ])
+            buf.write("\n## Executive Summary\n")
+            buf.write(data.get("summary", "No summary provided"))
+            buf.write("\n")
 
-        return "\n".join(content)
+        return buf.getvalue()
 
 
 class RetrospectiveTool(BaseTool):
@@ -114,7 +126,7 @@ class RetrospectiveTool(BaseTool):
                 action_items: List[Dict], participants: Optional[List[str]] = None,
                 timeframe: Optional[str] = None) -> Dict[str, Any]:
         """Create retrospective"""
-        retrospective_id = str(uuid.uuid4())
+        retrospective_id = new_id()
 
         retrospective = {
             "id": retrospective_id,
@@ -164,7 +176,7 @@ class ReflectionTool(BaseTool):
                 insights: Optional[List[str]] = None,
                 context: Optional[str] = None) -> Dict[str, Any]:
         """Record reflection"""
-        reflection_id = str(uuid.uuid4())
+        reflection_id = new_id()
 
         reflection_data = {
             "id": reflection_id,
@@ -184,12 +196,9 @@ class ReflectionTool(BaseTool):
 
     def _analyze_sentiment(self, text: str) -> str:
         """Simple sentiment analysis"""
-        positive_words = ["good", "great", "excellent", "success", "achieved", "completed"]
-        negative_words = ["bad", "failed", "issue", "problem", "challenge", "difficult"]
-
-        words = text.lower().split()
-        positive_count = sum(1 for w in words if w in positive_words)
-        negative_count = sum(1 for w in words if w in negative_words)
+        matches = _SENTIMENT_RE.findall(text.lower())
+        positive_count = sum(1 for m in matches if m in _POSITIVE_WORDS)
+        negative_count = len(matches) - positive_count
 
         if positive_count > negative_count:
             return "positive"
@@ -224,7 +233,7 @@ class SuggestImprovementsTool(BaseTool):
                 priority: str = "medium",
                 category: Optional[str] = None) -> Dict[str, Any]:
         """Suggest improvements"""
-        suggestion_id = str(uuid.uuid4())
+        suggestion_id = new_id()
 
         improvement_plan = {
             "id": suggestion_id,
@@ -244,11 +253,23 @@ class SuggestImprovementsTool(BaseTool):
 
     def _create_implementation_plan(self, suggestions: List[Dict]) -> Dict:
         """Create implementation plan from suggestions"""
-        return {
-            "immediate_actions": [s for s in suggestions if s.get("effort", "medium") == "low"],
-            "short_term_goals": [s for s in suggestions if s.get("effort", "medium") == "medium"],
-            "long_term_initiatives": [s for s in suggestions if s.get("effort", "medium") == "high"]
+        plan = {
+            "immediate_actions": [],
+            "short_term_goals": [],
+            "long_term_initiatives": []
         }
+        buckets = {
+            "low": plan["immediate_actions"],
+            "medium": plan["short_term_goals"],
+            "high": plan["long_term_initiatives"]
+        }
+
+        for s in suggestions:
+            bucket = buckets.get(s.get("effort", "medium"))
+            if bucket is not None:
+                bucket.append(s)
+
+        return plan
 
 
 class CompleteTaskTool(BaseTool):
@@ -279,7 +300,7 @@ class CompleteTaskTool(BaseTool):
                 outcomes: Optional[List[str]] = None,
                 next_steps: Optional[List[str]] = None) -> Dict[str, Any]:
         """Complete task"""
-        completion_id = str(uuid.uuid4())
+        completion_id = new_id()
 
         completion = {
             "id": completion_id,
@@ -326,7 +347,7 @@ class GenerateTodosTool(BaseTool):
                 assignee: Optional[str] = None,
                 due_date: Optional[str] = None) -> Dict[str, Any]:
         """Generate todos"""
-        todo_list_id = str(uuid.uuid4())
+        todo_list_id = new_id()
 
         todo_list = {
             "id": todo_list_id,
@@ -3,38 +3,73 @@ Research coordination and execution tools
 """
 
 import json
-import uuid
 from datetime import datetime
+from time import time as _now
 from typing import Dict, List, Any, Optional
 from src.tools import BaseTool
+from src.tools.ids import new_id
+
+
+# (whole second, formatted "YYYY-MM-DDTHH:MM:SS") of the last timestamp built
+_ts_cache = (0, "")
+
+
+def _ts() -> str:
+    """Local ISO-8601 timestamp with millisecond precision
+
+    The date/time part is formatted at most once per second; later calls
+    within the same second only append the milliseconds.
+    """
+    global _ts_cache
+    now = _now()
+    second = int(now)
+    cached_second, prefix = _ts_cache
+    if second != cached_second:
+        prefix = datetime.fromtimestamp(second).isoformat()
+        _ts_cache = (second, prefix)
+    return f"{prefix}.{int((now - second) * 1000):03d}"
+
+
+def _make_task(type_: str, assignee: str, **fields: Any) -> Dict[str, Any]:
+    """Build an assigned task record for the given assignee"""
+    return {
+        "id": new_id(),
+        "type": type_,
+        **fields,
+        "assignee": assignee,
+        "status": "assigned",
+        "created_at": _ts()
+    }
 
 
 class RequestResearchTool(BaseTool):
     """Request research on a specific topic"""
 
-    def get_schema(self):
-        return {
-            "type": "function",
-            "function": {
-                "name": "request_research",
-                "description": "Request research on a specific topic",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "topic": {"type": "string", "description": "Research topic"},
-                        "research_focus": {"type": "string", "description": "Specific focus areas"},
-                        "requirements": {"type": "array", "items": {"type": "string"}, "description": "Research requirements"},
-                        "round": {"type": "integer", "description": "Research round number"}
-                    },
-                    "required": ["topic", "research_focus", "requirements"]
-                }
+    _SCHEMA = {
+        "type": "function",
+        "function": {
+            "name": "request_research",
+            "description": "Request research on a specific topic",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "topic": {"type": "string", "description": "Research topic"},
+                    "research_focus": {"type": "string", "description": "Specific focus areas"},
+                    "requirements": {"type": "array", "items": {"type": "string"}, "description": "Research requirements"},
+                    "round": {"type": "integer", "description": "Research round number"}
+                },
+                "required": ["topic", "research_focus", "requirements"]
             }
         }
+    }
+
+    def get_schema(self):
+        return self._SCHEMA
 
     def execute(self, topic: str, research_focus: str,
                 requirements: List[str], round: int = 1) -> Dict[str, Any]:
         """Execute research request"""
-        request_id = str(uuid.uuid4())
+        request_id = new_id()
 
         request = {
             "id": request_id,
@@ -43,7 +78,7 @@ class RequestResearchTool(BaseTool):
             "requirements": requirements,
             "round": round,
             "status": "requested",
-            "created_at": datetime.now().isoformat()
+            "created_at": _ts()
         }
 
         return {
@@ -56,39 +91,31 @@ class RequestResearchTool(BaseTool):
 class AssignSearchTaskTool(BaseTool):
     """Assign search task to searcher"""
 
-    def get_schema(self):
-        return {
-            "type": "function",
-            "function": {
-                "name": "assign_search_task",
-                "description": "Assign a search task to the searcher",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "query": {"type": "string", "description": "Search query"},
-                        "focus_areas": {"type": "array", "items": {"type": "string"}, "description": "Focus areas"},
-                        "search_depth": {"type": "string", "enum": ["basic", "comprehensive"], "description": "Search depth"}
-                    },
-                    "required": ["query", "focus_areas"]
-                }
+    _SCHEMA = {
+        "type": "function",
+        "function": {
+            "name": "assign_search_task",
+            "description": "Assign a search task to the searcher",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "query": {"type": "string", "description": "Search query"},
+                    "focus_areas": {"type": "array", "items": {"type": "string"}, "description": "Focus areas"},
+                    "search_depth": {"type": "string", "enum": ["basic", "comprehensive"], "description": "Search depth"}
+                },
+                "required": ["query", "focus_areas"]
             }
         }
+    }
+
+    def get_schema(self):
+        return self._SCHEMA
 
     def execute(self, query: str, focus_areas: List[str],
                 search_depth: str = "comprehensive") -> Dict[str, Any]:
         """Execute search task assignment"""
-        task_id = str(uuid.uuid4())
-
-        task = {
-            "id": task_id,
-            "type": "search",
-            "query": query,
-            "focus_areas": focus_areas,
-            "search_depth": search_depth,
-            "assignee": "searcher",
-            "status": "assigned",
-            "created_at": datetime.now().isoformat()
-        }
+        task = _make_task("search", "searcher", query=query, focus_areas=focus_areas,
+                          search_depth=search_depth)
 
         return {
             "success": True,
@@ -100,39 +127,31 @@ class AssignSearchTaskTool(BaseTool):
 class AssignAnalysisTaskTool(BaseTool):
     """Assign analysis task to analyzer"""
 
-    def get_schema(self):
-        return {
-            "type": "function",
-            "function": {
-                "name": "assign_analysis_task",
-                "description": "Assign an analysis task to the analyzer",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "solutions": {"type": "array", "items": {"type": "string"}, "description": "Solutions to analyze"},
-                        "criteria": {"type": "array", "items": {"type": "string"}, "description": "Analysis criteria"},
-                        "analysis_type": {"type": "string", "description": "Type of analysis"}
-                    },
-                    "required": ["solutions", "criteria"]
-                }
+    _SCHEMA = {
+        "type": "function",
+        "function": {
+            "name": "assign_analysis_task",
+            "description": "Assign an analysis task to the analyzer",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "solutions": {"type": "array", "items": {"type": "string"}, "description": "Solutions to analyze"},
+                    "criteria": {"type": "array", "items": {"type": "string"}, "description": "Analysis criteria"},
+                    "analysis_type": {"type": "string", "description": "Type of analysis"}
+                },
+                "required": ["solutions", "criteria"]
             }
         }
+    }
+
+    def get_schema(self):
+        return self._SCHEMA
 
     def execute(self, solutions: List[str], criteria: List[str],
                 analysis_type: Optional[str] = None) -> Dict[str, Any]:
         """Execute analysis task assignment"""
-        task_id = str(uuid.uuid4())
-
-        task = {
-            "id": task_id,
-            "type": "analysis",
-            "solutions": solutions,
-            "criteria": criteria,
-            "analysis_type": analysis_type or "technical",
-            "assignee": "analyzer",
-            "status": "assigned",
-            "created_at": datetime.now().isoformat()
-        }
+        task = _make_task("analysis", "analyzer", solutions=solutions, criteria=criteria,
+                          analysis_type=analysis_type or "technical")
 
         return {
             "success": True,
@@ -144,38 +163,29 @@ class AssignAnalysisTaskTool(BaseTool):
 class AssignResearchTaskTool(BaseTool):
     """Assign deep research task to researcher"""
 
-    def get_schema(self):
-        return {
-            "type": "function",
-            "function": {
-                "name": "assign_research_task",
-                "description": "Assign a deep research task",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "topic": {"type": "string", "description": "Research topic"},
-                        "depth": {"type": "string", "enum": ["shallow", "medium", "deep"], "description": "Research depth"},
-                        "aspects": {"type": "array", "items": {"type": "string"}, "description": "Research aspects"}
-                    },
-                    "required": ["topic", "depth", "aspects"]
-                }
+    _SCHEMA = {
+        "type": "function",
+        "function": {
+            "name": "assign_research_task",
+            "description": "Assign a deep research task",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "topic": {"type": "string", "description": "Research topic"},
+                    "depth": {"type": "string", "enum": ["shallow", "medium", "deep"], "description": "Research depth"},
+                    "aspects": {"type": "array", "items": {"type": "string"}, "description": "Research aspects"}
+                },
+                "required": ["topic", "depth", "aspects"]
             }
         }
+    }
+
+    def get_schema(self):
+        return self._SCHEMA
 
     def execute(self, topic: str, depth: str, aspects: List[str]) -> Dict[str, Any]:
         """Execute research task assignment"""
-        task_id = str(uuid.uuid4())
-
-        task = {
-            "id": task_id,
-            "type": "research",
-            "topic": topic,
-            "depth": depth,
-            "aspects": aspects,
-            "assignee": "researcher",
-            "status": "assigned",
-            "created_at": datetime.now().isoformat()
-        }
+        task = _make_task("research", "researcher", topic=topic, depth=depth, aspects=aspects)
 
         return {
             "success": True,
@@ -187,33 +197,35 @@ class AssignResearchTaskTool(BaseTool):
 class SynthesizeFindingsTool(BaseTool):
     """Synthesize research findings"""
 
-    def get_schema(self):
-        return {
-            "type": "function",
-            "function": {
-                "name": "synthesize_findings",
-                "description": "Synthesize research findings from multiple sources",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "findings": {"type": "array", "items": {"type": "string"}, "description": "Research findings"},
-                        "key_insights": {"type": "array", "items": {"type": "string"}, "description": "Key insights"},
-                        "synthesis_type": {"type": "string", "description": "Type of synthesis"}
-                    },
-                    "required": ["findings", "key_insights"]
-                }
+    _SCHEMA = {
+        "type": "function",
+        "function": {
+            "name": "synthesize_findings",
+            "description": "Synthesize research findings from multiple sources",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "findings": {"type": "array", "items": {"type": "string"}, "description": "Research findings"},
+                    "key_insights": {"type": "array", "items": {"type": "string"}, "description": "Key insights"},
+                    "synthesis_type": {"type": "string", "description": "Type of synthesis"}
+                },
+                "required": ["findings", "key_insights"]
             }
         }
+    }
+
+    def get_schema(self):
+        return self._SCHEMA
 
     def execute(self, findings: List[str], key_insights: List[str],
                 synthesis_type: Optional[str] = None) -> Dict[str, Any]:
         """Execute findings synthesis"""
         synthesis = {
-            "id": str(uuid.uuid4()),
+            "id": new_id(),
             "findings": findings,
             "key_insights": key_insights,
             "synthesis_type": synthesis_type or "comprehensive",
-            "created_at": datetime.now().isoformat()
+            "created_at": _ts()
         }
 
         return {
@@ -226,34 +238,36 @@ class SynthesizeFindingsTool(BaseTool):
 class ReportCompletionTool(BaseTool):
     """Report research completion"""
 
-    def get_schema(self):
-        return {
-            "type": "function",
-            "function": {
-                "name": "report_completion",
-                "description": "Report research completion with summary",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "research_summary": {"type": "string", "description": "Research summary"},
-                        "recommendations": {"type": "array", "items": {"type": "string"}, "description": "Recommendations"},
-                        "next_steps": {"type": "array", "items": {"type": "string"}, "description": "Suggested next steps"}
-                    },
-                    "required": ["research_summary", "recommendations"]
-                }
+    _SCHEMA = {
+        "type": "function",
+        "function": {
+            "name": "report_completion",
+            "description": "Report research completion with summary",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "research_summary": {"type": "string", "description": "Research summary"},
+                    "recommendations": {"type": "array", "items": {"type": "string"}, "description": "Recommendations"},
+                    "next_steps": {"type": "array", "items": {"type": "string"}, "description": "Suggested next steps"}
+                },
+                "required": ["research_summary", "recommendations"]
             }
         }
+    }
+
+    def get_schema(self):
+        return self._SCHEMA
 
     def execute(self, research_summary: str, recommendations: List[str],
                 next_steps: Optional[List[str]] = None) -> Dict[str, Any]:
         """Execute completion report"""
         report = {
-            "id": str(uuid.uuid4()),
+            "id": new_id(),
             "research_summary": research_summary,
             "recommendations": recommendations,
             "next_steps": next_steps or [],
             "status": "completed",
-            "completed_at": datetime.now().isoformat()
+            "completed_at": _ts()
         }
 
         return {
@@ -266,31 +280,33 @@ class ReportCompletionTool(BaseTool):
 class PlanNextRoundTool(BaseTool):
     """Plan next research round"""
 
-    def get_schema(self):
-        return {
-            "type": "function",
-            "function": {
-                "name": "plan_next_round",
-                "description": "Plan the next round of research",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "next_steps": {"type": "string", "description": "Next steps description"},
-                        "focus_areas": {"type": "array", "items": {"type": "string"}, "description": "Focus areas for next round"}
-                    },
-                    "required": ["next_steps", "focus_areas"]
-                }
+    _SCHEMA = {
+        "type": "function",
+        "function": {
+            "name": "plan_next_round",
+            "description": "Plan the next round of research",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "next_steps": {"type": "string", "description": "Next steps description"},
+                    "focus_areas": {"type": "array", "items": {"type": "string"}, "description": "Focus areas for next round"}
+                },
+                "required": ["next_steps", "focus_areas"]
             }
         }
+    }
+
+    def get_schema(self):
+        return self._SCHEMA
 
     def execute(self, next_steps: str, focus_areas: List[str]) -> Dict[str, Any]:
         """Execute next round planning"""
         plan = {
-            "id": str(uuid.uuid4()),
+            "id": new_id(),
             "next_steps": next_steps,
             "focus_areas": focus_areas,
             "status": "planned",
-            "created_at": datetime.now().isoformat()
+            "created_at": _ts()
         }
 
         return {
@@ -7,18 +7,26 @@ import asyncio
 import subprocess
 import tempfile
 import os
+import select
+import shlex
 import shutil
+import signal
+import struct
 import sys
-import json
+import marshal
+import threading
 import time
-from typing import Dict, Any, Optional, Tuple
+import weakref
+from collections import OrderedDict, deque
+from importlib.util import find_spec
+from typing import Dict, Any, Optional, Sequence, Tuple, Union
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 
 from .decorators import tool
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ExecutionResult:
     """代码执行结果"""
     stdout: str = ""
@@ -28,18 +36,219 @@ class ExecutionResult:
     timestamp: datetime = field(default_factory=datetime.now)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SandboxConfig:
-    """沙箱配置"""
+    """沙箱配置（不可变、可哈希，可作为沙箱实例的缓存键）"""
     timeout: int = 30  # 执行超时时间（秒）
-    memory_limit: str = "512M"  # 内存限制
+    memory_limit: Optional[str] = "512M"  # 内存限制（如 "512M"、"2G"；None 表示不限制）
     working_dir: Optional[str] = None  # 工作目录
     python_path: Optional[str] = None  # Python路径
-    env_vars: Dict[str, str] = None  # 环境变量
+    env_vars: Union[Dict[str, str], Tuple[Tuple[str, str], ...], None] = None  # 环境变量
 
     def __post_init__(self):
-        if self.env_vars is None:
-            self.env_vars = {}
+        # 冻结为有序的 (key, value) 元组以便哈希
+        env_vars = dict(self.env_vars or ())
+        object.__setattr__(self, "env_vars", tuple(sorted(env_vars.items())))
+
+
+# 沙箱与当前进程使用同一解释器，pytest 不可用时退回 unittest
+_HAS_PYTEST = find_spec("pytest") is not None
+
+_SIZE_UNITS = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3, "T": 1024 ** 4}
+
+
+def _parse_memory_limit(limit: Optional[str]) -> Optional[int]:
+    """将 "512M"、"2G"、"1048576" 之类的内存限制解析为字节数"""
+    if not limit:
+        return None
+    text = str(limit).strip().upper()
+    if text.endswith("B"):
+        text = text[:-1]
+    unit = text[-1:] if text[-1:] in _SIZE_UNITS else ""
+    number = text[:-1] if unit else text
+    try:
+        return int(float(number) * _SIZE_UNITS[unit])
+    except ValueError:
+        raise ValueError(f"Invalid memory_limit: {limit!r}")
+
+
+def _make_rlimit_preexec(memory_bytes: Optional[int], cpu_seconds: int):
+    """构造子进程启动前执行的资源限制函数（仅 POSIX）"""
+    def _limit():
+        import resource
+        if memory_bytes:
+            resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds))
+    return _limit
+
+
+# 每个输出流最多保留的行数（只保留末尾部分）
+_MAX_OUTPUT_LINES = 10_000
+_READ_CHUNK_SIZE = 64 * 1024
+
+
+class _OutputTail:
+    """有界的输出缓冲区，只保留最后 maxlen 行"""
+
+    def __init__(self, maxlen: int = _MAX_OUTPUT_LINES):
+        self.lines: deque = deque(maxlen=maxlen)
+        self.dropped = 0
+        self._partial = b""
+
+    def feed(self, chunk: bytes) -> None:
+        parts = (self._partial + chunk).split(b"\n")
+        self._partial = parts.pop()
+        for line in parts:
+            if len(self.lines) == self.lines.maxlen:
+                self.dropped += 1
+            self.lines.append(line)
+
+    def text(self) -> str:
+        lines = list(self.lines)
+        if self._partial:
+            lines.append(self._partial)
+        data = b"\n".join(lines)
+        if self.lines and not self._partial:
+            data += b"\n"
+        text = data.decode('utf-8', errors='replace')
+        if self.dropped:
+            text = f"...[{self.dropped} lines truncated]\n" + text
+        return text
+
+
+async def _drain_stream(stream: asyncio.StreamReader, tail: _OutputTail) -> None:
+    """持续读取子进程输出直到 EOF，避免整体缓冲在内存中"""
+    while True:
+        chunk = await stream.read(_READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        tail.feed(chunk)
+
+
+def _read_tail(path: str) -> str:
+    """读取输出文件，只保留末尾部分"""
+    tail = _OutputTail()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(_READ_CHUNK_SIZE), b""):
+                tail.feed(chunk)
+    except FileNotFoundError:
+        pass
+    return tail.text()
+
+
+def _kill_process_group(pid: int) -> None:
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+# 常驻 worker 进程：从 stdin 读取长度前缀的 marshal 请求，每个请求 fork 一个子进程
+# 执行 main.py（子进程间互相隔离），子进程输出重定向到文件，结束后回写退出码。
+# 省去每次执行都要付出的解释器启动开销。
+# worker 在沙箱目录之外启动、不带 PYTHONPATH，fork 前只导入内置模块；子进程丢弃
+# 启动后额外导入的模块，用户的同名文件（json.py 等）与单独启动进程时一样生效。
+_WORKER_SOURCE = r"""
+import sys
+_BASE_MODULES = set(sys.modules)
+import marshal, os
+
+def _read_exact(n):
+    buf = b""
+    while len(buf) < n:
+        chunk = os.read(0, n - len(buf))
+        if not chunk:
+            os._exit(0)
+        buf += chunk
+    return buf
+
+def _run(req):
+    import resource
+    if req["memory"]:
+        resource.setrlimit(resource.RLIMIT_AS, (req["memory"], req["memory"]))
+    resource.setrlimit(resource.RLIMIT_CPU, (req["cpu"], req["cpu"]))
+    for name in set(sys.modules) - _BASE_MODULES:
+        del sys.modules[name]
+
+    null = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(null, 0)
+    os.close(null)
+    for fd, path in ((1, req["stdout"]), (2, req["stderr"])):
+        out = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        os.dup2(out, fd)
+        os.close(out)
+    os.chdir(req["cwd"])
+    os.environ["PYTHONPATH"] = req["pythonpath"]
+
+    path = req["main"]
+    sys.argv = [path]
+    sys.path[0] = os.path.dirname(path)
+    main = type(sys)("__main__")
+    main.__file__ = path
+    main.__builtins__ = __builtins__
+    sys.modules["__main__"] = main
+    code = 0
+    try:
+        with open(path, "rb") as f:
+            source = f.read()
+        exec(compile(source, path, "exec"), main.__dict__)
+    except SystemExit as e:
+        if e.code is None:
+            code = 0
+        elif isinstance(e.code, int):
+            code = e.code
+        else:
+            print(e.code, file=sys.stderr)
+            code = 1
+    except BaseException as e:
+        # 跳过 worker 自身的栈帧，与直接运行 main.py 的回溯一致
+        tb = e.__traceback__
+        while tb is not None and tb.tb_frame.f_code.co_filename != path:
+            tb = tb.tb_next
+        sys.excepthook(type(e), e.with_traceback(tb or e.__traceback__), tb or e.__traceback__)
+        code = 1
+    # 与解释器正常退出的顺序一致：先等待非守护线程，再执行 atexit 回调
+    threading = sys.modules.get("threading")
+    if threading is not None:
+        try:
+            threading._shutdown()
+        except BaseException:
+            pass
+    try:
+        import atexit
+        atexit._run_exitfuncs()
+    except BaseException:
+        pass
+    for stream in (sys.stdout, sys.stderr):
+        try:
+            stream.flush()
+        except BaseException:
+            pass
+    return code
+
+while True:
+    req = marshal.loads(_read_exact(int.from_bytes(_read_exact(4), "big")))
+    pid = os.fork()
+    if pid == 0:
+        code = 1
+        try:
+            code = _run(req)
+        finally:
+            os._exit(code & 0xFF)
+    _, status = os.waitpid(pid, 0)
+    reply = marshal.dumps(os.waitstatus_to_exitcode(status))
+    os.write(1, len(reply).to_bytes(4, "big") + reply)
+"""
+
+# test_main.py 的首行：把 main 模块的全局名称（模块属性 __name__ 等除外）复制到测试模块
+_TEST_PRELUDE = (
+    "import main as _sandbox_main; globals().update({k: v for k, v in vars(_sandbox_main).items() "
+    "if not (k.startswith('__') and k.endswith('__'))})\n"
+)
+
+# 常驻 worker 依赖 fork，其他平台每次启动新进程
+_USE_WORKER = hasattr(os, "fork")
 
 
 class PythonSandbox:
@@ -48,16 +257,32 @@ class PythonSandbox:
     def __init__(self, config: Optional[SandboxConfig] = None):
         self.config = config or SandboxConfig()
         self.temp_dir = None
+        # 常驻 worker 进程，首次执行时启动
+        self._worker: Optional[subprocess.Popen] = None
+        self._worker_lock = threading.Lock()
+        # 已写入文件的 {路径: (内容哈希, mtime_ns, 大小)}，用于跳过重复写入
+        self._written: Dict[str, Tuple[int, int, int]] = {}
+        # 正在执行的调用数；被移出缓存（retired）的实例在空闲后才清理，清理后再次使用时重建目录
+        self._state_lock = threading.Lock()
+        self._runs = 0
+        self._retired = False
+        self._closed = False
         self._setup()
 
     def _setup(self):
         """设置沙箱环境"""
         # 创建临时目录
         self.temp_dir = tempfile.mkdtemp(prefix="deepcode_sandbox_")
+        # 实例被回收或解释器退出时删除临时目录；不持有 self，不影响循环引用回收
+        self._finalizer = weakref.finalize(self, shutil.rmtree, self.temp_dir, ignore_errors=True)
+        # 已确认存在的目录，避免每个文件都 makedirs
+        self._dirs = {self.temp_dir}
+        # worker 模式下子进程输出文件所在目录（与用户文件分开）
+        self._io_dir = tempfile.mkdtemp(prefix="deepcode_sandbox_io_")
+        self._io_finalizer = weakref.finalize(self, shutil.rmtree, self._io_dir, ignore_errors=True)
 
         # 设置工作目录
-        if not self.config.working_dir:
-            self.config.working_dir = self.temp_dir
+        self.working_dir = self.config.working_dir or self.temp_dir
 
         # 准备环境变量
         env = os.environ.copy()
@@ -68,11 +293,61 @@ class PythonSandbox:
 
         self.env = env
 
+        # 由内核限制子进程的内存和 CPU 时间
+        self._preexec_fn = None
+        if os.name == 'posix':
+            self._preexec_fn = _make_rlimit_preexec(
+                _parse_memory_limit(self.config.memory_limit),
+                self.config.timeout + 5
+            )
+
+    def _write_file(self, filepath: str, content: str) -> None:
+        """写入文件；内容与上次相同且文件未被改动时跳过"""
+        content_hash = hash(content)
+        previous = self._written.get(filepath)
+        if previous is not None and previous[0] == content_hash:
+            try:
+                st = os.stat(filepath)
+            except OSError:
+                pass
+            else:
+                if (st.st_mtime_ns, st.st_size) == previous[1:]:
+                    return
+
+        Path(filepath).write_bytes(content.encode('utf-8'))
+        st = os.stat(filepath)
+        self._written[filepath] = (content_hash, st.st_mtime_ns, st.st_size)
+
+    def _begin_run(self) -> None:
+        with self._state_lock:
+            self._runs += 1
+            if self._closed:
+                self._setup()
+                self._closed = False
+
+    def _end_run(self) -> bool:
+        """结束一次执行，返回是否应清理（已移出缓存且没有其他执行中的调用）"""
+        with self._state_lock:
+            self._runs -= 1
+            return self._retired and self._runs == 0
+
+    def _retire(self) -> bool:
+        """标记为已移出缓存，返回当前是否空闲"""
+        with self._state_lock:
+            self._retired = True
+            return self._runs == 0
+
+    def _cleanup_if_idle(self) -> None:
+        """没有执行中的调用时清理（清理期间新的调用等待目录重建）"""
+        with self._state_lock:
+            if self._runs == 0 and not self._closed:
+                self.cleanup()
+
     async def execute_code(
         self,
         code: str,
         files: Optional[Dict[str, str]] = None,
-        command: Optional[str] = None
+        command: Optional[Union[str, Sequence[str]]] = None
     ) -> ExecutionResult:
         """
         执行代码
@@ -80,11 +355,25 @@ class PythonSandbox:
         Args:
             code: 要执行的代码
             files: 额外的文件 {filename: content}
-            command: 自定义执行命令
+            command: 自定义执行命令（参数列表；字符串会按 shell 规则拆分，但不经过 shell 执行）
 
         Returns:
             ExecutionResult: 执行结果
         """
+        self._begin_run()
+        try:
+            return await self._execute_code(code, files, command)
+        finally:
+            if self._end_run():
+                # 已移出缓存的实例在最后一次执行结束后清理，放到线程中以免阻塞事件循环
+                await asyncio.to_thread(self._cleanup_if_idle)
+
+    async def _execute_code(
+        self,
+        code: str,
+        files: Optional[Dict[str, str]],
+        command: Optional[Union[str, Sequence[str]]]
+    ) -> ExecutionResult:
         start_time = time.time()
 
         try:
@@ -92,45 +381,32 @@ class PythonSandbox:
             if files:
                 for filename, content in files.items():
                     filepath = os.path.join(self.temp_dir, filename)
-                    os.makedirs(os.path.dirname(filepath), exist_ok=True)
-                    with open(filepath, 'w', encoding='utf-8') as f:
-                        f.write(content)
+                    dirname = os.path.dirname(filepath)
+                    if dirname not in self._dirs:
+                        os.makedirs(dirname, exist_ok=True)
+                        self._dirs.add(dirname)
+                    try:
+                        self._write_file(filepath, content)
+                    except FileNotFoundError:
+                        # 目录被之前运行的代码删除
+                        os.makedirs(dirname, exist_ok=True)
+                        self._write_file(filepath, content)
 
             # 写入主代码文件
             main_file = os.path.join(self.temp_dir, "main.py")
-            with open(main_file, 'w', encoding='utf-8') as f:
-                f.write(code)
-
-            # 构建执行命令
-            if not command:
-                command = f"{sys.executable} main.py"
-
-            # 执行代码
-            process = await asyncio.create_subprocess_shell(
-                command,
-                cwd=self.config.working_dir,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                env=self.env
-            )
+            self._write_file(main_file, code)
 
-            # 等待执行完成
-            try:
-                stdout, stderr = await asyncio.wait_for(
-                    process.communicate(),
-                    timeout=self.config.timeout
-                )
-            except asyncio.TimeoutError:
-                process.kill()
-                await process.wait()
-                stdout, stderr = b"", b"Execution timeout"
-                return_code = -1
+            # 执行代码：默认命令交给常驻 worker，自定义命令启动新进程
+            if not command and _USE_WORKER:
+                stdout_str, stderr_str, return_code = await self._run_in_worker(main_file)
             else:
-                return_code = process.returncode
-
-            # 处理输出
-            stdout_str = stdout.decode('utf-8', errors='replace')
-            stderr_str = stderr.decode('utf-8', errors='replace')
+                if not command:
+                    argv = (sys.executable, "main.py")
+                elif isinstance(command, str):
+                    argv = shlex.split(command)
+                else:
+                    argv = command
+                stdout_str, stderr_str, return_code = await self._run_process(argv)
 
             execution_time = time.time() - start_time
 
@@ -150,6 +426,125 @@ class PythonSandbox:
                 execution_time=execution_time
             )
 
+    async def _run_process(self, argv: Sequence[str]) -> Tuple[str, str, int]:
+        """启动新进程执行命令（直接 exec，不经过 /bin/sh），返回 (stdout, stderr, 退出码)"""
+        process = await asyncio.create_subprocess_exec(
+            *argv,
+            cwd=self.working_dir,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=self.env,
+            preexec_fn=self._preexec_fn
+        )
+
+        # 边执行边读取输出，只保留末尾部分
+        stdout_tail, stderr_tail = _OutputTail(), _OutputTail()
+        readers = asyncio.gather(
+            _drain_stream(process.stdout, stdout_tail),
+            _drain_stream(process.stderr, stderr_tail),
+        )
+
+        # 等待执行完成
+        try:
+            await asyncio.wait_for(
+                asyncio.shield(readers),
+                timeout=self.config.timeout
+            )
+            await process.wait()
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            # 子进程派生的后代可能仍持有管道，最多再等 1 秒
+            try:
+                await asyncio.wait_for(readers, timeout=1)
+            except asyncio.TimeoutError:
+                pass
+            return stdout_tail.text(), stderr_tail.text() + "Execution timeout", -1
+
+        return stdout_tail.text(), stderr_tail.text(), process.returncode
+
+    def _ensure_worker(self) -> subprocess.Popen:
+        """获取常驻 worker，未启动或已退出时重新启动（调用方需持有 _worker_lock）"""
+        worker = self._worker
+        if worker is not None and worker.poll() is None:
+            return worker
+        self._stop_worker()
+
+        # 独立进程组，超时时可连同正在执行的子进程一起结束；worker 自身不能从沙箱目录导入模块，
+        # 工作目录和 PYTHONPATH 由子进程在执行前设置
+        env = dict(self.env)
+        env.pop("PYTHONPATH", None)
+        self._worker = subprocess.Popen(
+            [sys.executable, "-c", _WORKER_SOURCE],
+            cwd=self._io_dir,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            env=env,
+            start_new_session=True
+        )
+        return self._worker
+
+    def _stop_worker(self) -> None:
+        worker, self._worker = self._worker, None
+        if worker is not None:
+            _kill_process_group(worker.pid)
+            worker.wait()
+            worker.stdin.close()
+            worker.stdout.close()
+
+    def _run_in_worker_sync(self, main_file: str) -> Tuple[str, str, int]:
+        """在常驻 worker 中执行 main.py（阻塞），返回 (stdout, stderr, 退出码)"""
+        stdout_path = os.path.join(self._io_dir, "stdout")
+        stderr_path = os.path.join(self._io_dir, "stderr")
+        request = marshal.dumps({
+            "main": main_file,
+            "cwd": self.working_dir,
+            "pythonpath": self.env["PYTHONPATH"],
+            "stdout": stdout_path,
+            "stderr": stderr_path,
+            "memory": _parse_memory_limit(self.config.memory_limit),
+            "cpu": self.config.timeout + 5,
+        })
+
+        def _result(return_code: int, note: str = "") -> Tuple[str, str, int]:
+            return _read_tail(stdout_path), _read_tail(stderr_path) + note, return_code
+
+        with self._worker_lock:
+            # 清掉上一次的输出，worker 启动失败时不会误读旧结果
+            for path in (stdout_path, stderr_path):
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+
+            worker = self._ensure_worker()
+            try:
+                worker.stdin.write(struct.pack(">I", len(request)) + request)
+                worker.stdin.flush()
+            except BrokenPipeError:
+                self._stop_worker()
+                return _result(-1, "Sandbox worker exited unexpectedly")
+
+            fd = worker.stdout.fileno()
+            deadline = time.monotonic() + self.config.timeout
+            reply = b""
+            while len(reply) < 4 or len(reply) < 4 + struct.unpack(">I", reply[:4])[0]:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                    self._stop_worker()
+                    return _result(-1, "Execution timeout")
+                chunk = os.read(fd, _READ_CHUNK_SIZE)
+                if not chunk:
+                    self._stop_worker()
+                    return _result(-1, "Sandbox worker exited unexpectedly")
+                reply += chunk
+            return _result(marshal.loads(reply[4:]))
+
+    async def _run_in_worker(self, main_file: str) -> Tuple[str, str, int]:
+        """在常驻 worker 中执行 main.py；worker 通过阻塞管道通信，不绑定事件循环，在线程中等待结果"""
+        return await asyncio.to_thread(self._run_in_worker_sync, main_file)
+
     async def execute_test(self, code: str, test_code: str) -> ExecutionResult:
         """
         执行测试代码
@@ -161,49 +556,49 @@ class PythonSandbox:
         Returns:
             ExecutionResult: 测试结果
         """
-        combined_code = f"""
-# Main code
-{code}
-
-# Test code
-{test_code}
-
-# Run tests
-if __name__ == "__main__":
-    import unittest
-
-    # Create test suite
-    suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
-
-    # Run tests
-    runner = unittest.TextTestRunner(verbosity=2)
-    result = runner.run(suite)
-
-    # Exit with appropriate code
-    sys.exit(0 if result.wasSuccessful() else 1)
-"""
-        return await self.execute_code(combined_code)
+        # 主代码和测试代码分别写入 main.py / test_main.py；测试文件导入 main 的全部全局名称
+        # （包括下划线开头、不在 __all__ 中的名称，与两者写在同一模块时一致），只占一行
+        files = {"test_main.py": _TEST_PRELUDE + test_code}
+        if _HAS_PYTEST:
+            command = [sys.executable, "-m", "pytest", "-x", "-q", "--no-header", "-p", "no:cacheprovider", "test_main.py"]
+        else:
+            command = [sys.executable, "-m", "unittest", "-v", "test_main"]
+        return await self.execute_code(code=code, files=files, command=command)
 
     def cleanup(self):
-        """清理沙箱环境"""
-        if self.temp_dir and os.path.exists(self.temp_dir):
-            shutil.rmtree(self.temp_dir, ignore_errors=True)
-
-    def __del__(self):
-        """析构时自动清理"""
-        self.cleanup()
+        """清理沙箱环境（可重复调用，临时目录只删除一次）"""
+        with self._worker_lock:
+            self._stop_worker()
+        self._finalizer()
+        self._io_finalizer()
+        self._written.clear()
+        self._dirs.clear()
+        self._closed = True
 
 
-# 全局沙箱实例
-_sandbox_instance = None
+# 按配置缓存的沙箱实例（LRU）；每个实例持有常驻 worker 和临时目录，超出上限时清理最久未用的
+_MAX_SANDBOXES = 8
+_sandboxes: "OrderedDict[SandboxConfig, PythonSandbox]" = OrderedDict()
+_sandboxes_lock = threading.Lock()
 
 
 def get_sandbox(config: Optional[SandboxConfig] = None) -> PythonSandbox:
-    """获取沙箱实例（单例模式）"""
-    global _sandbox_instance
-    if _sandbox_instance is None:
-        _sandbox_instance = PythonSandbox(config)
-    return _sandbox_instance
+    """获取沙箱实例（每种配置一个实例，最多缓存 _MAX_SANDBOXES 个，线程安全）"""
+    key = config or SandboxConfig()
+    evicted = None
+    with _sandboxes_lock:
+        sandbox = _sandboxes.get(key)
+        if sandbox is None:
+            sandbox = _sandboxes[key] = PythonSandbox(key)
+            if len(_sandboxes) > _MAX_SANDBOXES:
+                _, evicted = _sandboxes.popitem(last=False)
+        else:
+            _sandboxes.move_to_end(key)
+    if evicted is not None and evicted._retire():
+        # 空闲的实例在后台线程中清理，不阻塞调用方（通常是事件循环）；
+        # 仍在执行的实例由其最后一次执行结束时清理
+        threading.Thread(target=evicted._cleanup_if_idle).start()
+    return sandbox
 
 
 @tool
@@ -223,9 +618,7 @@ async def execute_python_code(
     Returns:
         Dict: 包含执行结果的字典
     """
-    config = SandboxConfig()
-    if timeout:
-        config.timeout = timeout
+    config = SandboxConfig(timeout=timeout) if timeout else SandboxConfig()
 
     sandbox = get_sandbox(config)
     result = await sandbox.execute_code(code, files)
@@ -256,9 +649,7 @@ async def run_code_with_tests(
     Returns:
         Dict: 包含测试结果的字典
     """
-    config = SandboxConfig()
-    if timeout:
-        config.timeout = timeout
+    config = SandboxConfig(timeout=timeout) if timeout else SandboxConfig()
 
     sandbox = get_sandbox(config)
     result = await sandbox.execute_test(code, test_code)
@@ -291,7 +682,7 @@ async def install_package(package_name: str, version: Optional[str] = None) -> D
 
     result = await sandbox.execute_code(
         code=f"",
-        command=f"pip install {package_spec}"
+        command=[sys.executable, "-m", "pip", "install", package_spec]
     )
 
     return {
@@ -307,8 +698,11 @@ def cleanup_sandbox():
     """
     清理沙箱环境
     """
-    global _sandbox_instance
-    if _sandbox_instance:
-        _sandbox_instance.cleanup()
-        _sandbox_instance = None
+    with _sandboxes_lock:
+        sandboxes = list(_sandboxes.values())
+        _sandboxes.clear()
+    for sandbox in sandboxes:
+        # 仍在执行的实例由其最后一次执行结束时清理
+        if sandbox._retire():
+            sandbox._cleanup_if_idle()
     return {"status": "cleaned"}
\ No newline at end of file
@@ -1,18 +1,90 @@
-import json
+import atexit
 import logging
 import os
 import asyncio
-from typing import Any, Dict, List, Optional
-
-import aiohttp
-import requests
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 from src.config import SearchEngine, load_yaml_config
 from src.tools.decorators import BaseTool
+from src.tools.json_utils import dumps as json_dumps, dumps_bytes as json_dumps_bytes, loads as json_loads
+from src.tools.rate_limit import get_backend_limiter
+from src.tools.search_cache import SearchResultCache
+
+if TYPE_CHECKING:
+    import aiohttp
 
 logger = logging.getLogger(__name__)
 
 
+# 同一会话内相同查询直接复用结果（10 分钟有效，最多 512 条）
+_search_cache = SearchResultCache(maxsize=512, ttl=600.0)
+
+# 同步搜索库（DDG）专用线程池，并发搜索时不与默认执行器争用
+_SEARCH_POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix="search")
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+_http_session: Optional["aiohttp.ClientSession"] = None
+_http_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+async def get_http_session() -> "aiohttp.ClientSession":
+    """
+    获取共享的 aiohttp 会话
+
+    连接在多次搜索之间复用（连接池 + TLS 会话复用）。会话绑定创建它的事件循环，
+    循环变化或会话已关闭时重新创建，并关闭被替换的旧会话。
+    """
+    global _http_session, _http_session_loop
+    loop = asyncio.get_running_loop()
+    if _http_session is None or _http_session.closed or _http_session_loop is not loop:
+        import aiohttp
+
+        stale, stale_loop = _http_session, _http_session_loop
+        connector = aiohttp.TCPConnector(limit=100, ttl_dns_cache=300, keepalive_timeout=60)
+        # trust_env：与 requests 一样遵循 HTTP(S)_PROXY 等代理环境变量
+        _http_session = aiohttp.ClientSession(
+            connector=connector, json_serialize=json_dumps, trust_env=True
+        )
+        _http_session_loop = loop
+        if stale is not None and not stale.closed:
+            await _close_session(stale, stale_loop)
+    return _http_session
+
+
+async def _close_session(session: "aiohttp.ClientSession", loop: asyncio.AbstractEventLoop) -> None:
+    """关闭绑定在 loop 上的会话，所属循环仍在其他线程运行时交由该循环执行"""
+    try:
+        if loop is not asyncio.get_running_loop() and loop.is_running() and not loop.is_closed():
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(session.close(), loop))
+        else:
+            await session.close()
+    except Exception as e:
+        logger.debug(f"关闭旧的 HTTP 会话失败: {e}")
+
+
+async def close_http_session() -> None:
+    """关闭共享的 aiohttp 会话（应在事件循环结束前调用）"""
+    global _http_session, _http_session_loop
+    session, loop = _http_session, _http_session_loop
+    _http_session = None
+    _http_session_loop = None
+    if session is not None and not session.closed:
+        await _close_session(session, loop)
+
+
+@atexit.register
+def _close_http_session_at_exit() -> None:
+    """进程退出时关闭仍打开的共享会话（其事件循环仍可用时）"""
+    loop = _http_session_loop
+    if _http_session is None or _http_session.closed or loop is None:
+        return
+    if not loop.is_closed() and not loop.is_running():
+        loop.run_until_complete(close_http_session())
+
+
 def get_search_config() -> Dict[str, Any]:
     """获取搜索配置"""
     config = load_yaml_config("conf.yaml")
@@ -25,10 +97,61 @@ class BaseWebSearchTool(BaseTool):
 
     name: str = "web_search"
     description: str = "网络搜索工具"
+    # 后端限流：(每秒请求数, 突发请求数, 最大并发数)，同一后端的所有实例共享
+    rate_limit: Tuple[float, float, int] = (5.0, 10, 8)
 
-    def __init__(self, max_results: int = 5):
+    def __init__(self, max_results: int = 5, session: Optional["aiohttp.ClientSession"] = None):
         super().__init__()
         self.max_results = max_results
+        self._session = session
+
+    async def _get_session(self) -> "aiohttp.ClientSession":
+        """返回构造时传入的会话，否则使用模块共享会话"""
+        if self._session is not None:
+            return self._session
+        return await get_http_session()
+
+    def _cache_params(self) -> tuple:
+        """影响结果的配置参数，参与缓存键计算"""
+        return (self.max_results,)
+
+    async def execute(self, query: str) -> str:
+        """异步执行搜索，命中缓存时不发起请求"""
+        key = (type(self).__name__, query, self._cache_params())
+        return await _search_cache.get_or_fetch(key, lambda: self._limited_fetch(query))
+
+    async def execute_many(self, queries: List[str]) -> List[str]:
+        """
+        并发执行多个查询
+
+        各查询仍经过缓存与后端限流，共享同一个 HTTP 会话同时在途，
+        总耗时接近最慢的单个请求（受限于后端的并发上限）。
+
+        Args:
+            queries: 查询列表
+
+        Returns:
+            与 queries 顺序一致的结果列表，单个查询失败时对应位置为 {"error": ...}
+        """
+        results = await asyncio.gather(
+            *(self.execute(query) for query in queries),
+            return_exceptions=True
+        )
+        return [
+            json_dumps({"error": str(r)}) if isinstance(r, BaseException) else r
+            for r in results
+        ]
+
+    search_many = execute_many
+
+    async def _limited_fetch(self, query: str) -> str:
+        """在后端限流器的许可下执行搜索"""
+        async with get_backend_limiter(self.name, *self.rate_limit):
+            return await self._fetch(query)
+
+    async def _fetch(self, query: str) -> str:
+        """实际执行搜索，子类实现"""
+        raise NotImplementedError
 
 
 class TavilySearchTool(BaseWebSearchTool):
@@ -47,23 +170,21 @@ class TavilySearchTool(BaseWebSearchTool):
         include_raw_content: bool = True,
         include_images: bool = True,
         include_image_descriptions: bool = True,
+        session: Optional["aiohttp.ClientSession"] = None,
     ):
-        super().__init__(max_results)
-        self.include_domains = include_domains or []
-        self.exclude_domains = exclude_domains or []
+        super().__init__(max_results, session)
+        # 不可变元组：未指定时共享空元组，按 JSON 数组发送
+        self.include_domains = tuple(include_domains) if include_domains else ()
+        self.exclude_domains = tuple(exclude_domains) if exclude_domains else ()
         self.include_answer = include_answer
         self.search_depth = search_depth
         self.include_raw_content = include_raw_content
         self.include_images = include_images
         self.include_image_descriptions = include_image_descriptions
         self.api_key = os.getenv("TAVILY_API_KEY", "")
-
-    async def execute(self, query: str) -> str:
-        """异步执行搜索"""
-        params = {
+        # 每次请求都相同的参数只构建一次
+        self._base_params = {
             "api_key": self.api_key,
-            "query": query,
-            "max_results": self.max_results,
             "search_depth": self.search_depth,
             "include_domains": self.include_domains,
             "exclude_domains": self.exclude_domains,
@@ -73,14 +194,31 @@ class TavilySearchTool(BaseWebSearchTool):
             "include_image_descriptions": self.include_image_descriptions,
         }
 
+    def _cache_params(self) -> tuple:
+        return (
+            self.max_results,
+            self.search_depth,
+            self.include_domains,
+            self.exclude_domains,
+            self.include_answer,
+            self.include_raw_content,
+            self.include_images,
+            self.include_image_descriptions,
+        )
+
+    async def _fetch(self, query: str) -> str:
+        """异步执行搜索"""
+        params = {**self._base_params, "query": query, "max_results": self.max_results}
+
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    "https://api.tavily.com/search",
-                    json=params
-                ) as response:
-                    response.raise_for_status()
-                    raw_results = await response.json()
+            session = await self._get_session()
+            async with session.post(
+                "https://api.tavily.com/search",
+                data=json_dumps_bytes(params),
+                headers=_JSON_HEADERS
+            ) as response:
+                response.raise_for_status()
+                raw_results = json_loads(await response.read())
 
             # 处理结果
             results = raw_results.get("results", [])
@@ -115,28 +253,36 @@ class TavilySearchTool(BaseWebSearchTool):
                     "content": raw_results["answer"]
                 })
 
-            return json.dumps(clean_results, ensure_ascii=False)
+            return json_dumps(clean_results)
 
         except Exception as e:
             logger.error(f"Tavily search error: {e}")
-            return json.dumps({"error": str(e)}, ensure_ascii=False)
+            return json_dumps({"error": str(e)})
 
-    
 
 class DuckDuckGoSearchTool(BaseWebSearchTool):
     """DuckDuckGo 搜索工具"""
 
     name: str = "duckduckgo_search"
     description: str = "使用 DuckDuckGo 进行网络搜索"
+    rate_limit = (1.0, 3, 2)  # DuckDuckGo 对高频请求限制严格
 
-    async def execute(self, query: str) -> str:
+    _ddgs_cls = None
+
+    @classmethod
+    def _get_ddgs_cls(cls):
+        """首次使用时导入 DDGS"""
+        if cls._ddgs_cls is None:
+            from ddgs import DDGS
+            cls._ddgs_cls = DDGS
+        return cls._ddgs_cls
+
+    async def _fetch(self, query: str) -> str:
         """异步执行搜索"""
         def _search():
             try:
-                from ddgs import DDGS
-
                 results = []
-                with DDGS() as ddgs:
+                with self._get_ddgs_cls()() as ddgs:
                     search_results = ddgs.text(
                         query,
                         max_results=self.max_results,
@@ -150,14 +296,14 @@ class DuckDuckGoSearchTool(BaseWebSearchTool):
                             "content": r.get("body", ""),
                         })
 
-                return json.dumps(results, ensure_ascii=False)
+                return json_dumps(results)
 
             except Exception as e:
                 logger.error(f"DuckDuckGo search error: {e}")
-                return json.dumps({"error": str(e)}, ensure_ascii=False)
+                return json_dumps({"error": str(e)})
 
-        # 在单独的线程中运行同步搜索
-        return await asyncio.to_thread(_search)
+        # 在搜索线程池中运行同步搜索
+        return await asyncio.get_running_loop().run_in_executor(_SEARCH_POOL, _search)
 
 
 
@@ -167,40 +313,57 @@ class ArxivSearchTool(BaseWebSearchTool):
 
     name: str = "arxiv_search"
     description: str = "搜索 ArXiv 学术论文"
+    rate_limit = (1 / 3, 1, 1)  # ArXiv API 要求两次请求间隔至少 3 秒
 
-    async def execute(self, query: str) -> str:
-        """异步执行搜索"""
-        def _search():
-            try:
-                import arxiv
-
-                results = []
-                search = arxiv.Search(
-                    query=query,
-                    max_results=self.max_results,
-                    sort_by=arxiv.SortCriterion.Relevance,
-                )
+    _feedparser = None
 
-                for r in search.results():
-                    results.append({
-                        "type": "paper",
-                        "title": r.title,
-                        "url": r.entry_id,
-                        "content": r.summary,
-                        "authors": [str(a) for a in r.authors],
-                        "published": str(r.published),
-                        "categories": r.categories,
-                    })
+    @classmethod
+    def _get_feedparser(cls):
+        """首次使用时导入 feedparser"""
+        if cls._feedparser is None:
+            import feedparser
+            cls._feedparser = feedparser
+        return cls._feedparser
 
-                return json.dumps(results, ensure_ascii=False)
+    async def _fetch(self, query: str) -> str:
+        """异步执行搜索：通过共享会话请求 ArXiv Atom API，并用 feedparser 解析"""
+        params = {
+            "search_query": f"all:{query}",
+            "start": "0",
+            "max_results": str(self.max_results),
+            "sortBy": "relevance",
+            "sortOrder": "descending",
+        }
 
-            except Exception as e:
-                logger.error(f"ArXiv search error: {e}")
-                return json.dumps({"error": str(e)}, ensure_ascii=False)
+        try:
+            feedparser = self._get_feedparser()
+
+            session = await self._get_session()
+            async with session.get(
+                "https://export.arxiv.org/api/query",
+                params=params
+            ) as response:
+                response.raise_for_status()
+                body = await response.read()
+
+            feed = feedparser.parse(body)
+            results = []
+            for entry in feed.entries:
+                results.append({
+                    "type": "paper",
+                    "title": " ".join(entry.get("title", "").split()),
+                    "url": entry.get("id", ""),
+                    "content": entry.get("summary", ""),
+                    "authors": [a.get("name", "") for a in entry.get("authors", [])],
+                    "published": entry.get("published", ""),
+                    "categories": [t.get("term", "") for t in entry.get("tags", [])],
+                })
 
-        # 在单独的线程中运行同步搜索
-        return await asyncio.to_thread(_search)
+            return json_dumps(results)
 
+        except Exception as e:
+            logger.error(f"ArXiv search error: {e}")
+            return json_dumps({"error": str(e)})
 
 
 class WikipediaSearchTool(BaseWebSearchTool):
@@ -208,51 +371,110 @@ class WikipediaSearchTool(BaseWebSearchTool):
 
     name: str = "wikipedia_search"
     description: str = "搜索 Wikipedia 百科全书"
+    rate_limit = (10.0, 20, 8)
 
-    def __init__(self, max_results: int = 5, lang: str = "en"):
-        super().__init__(max_results)
+    def __init__(
+        self,
+        max_results: int = 5,
+        lang: str = "en",
+        session: Optional["aiohttp.ClientSession"] = None,
+    ):
+        super().__init__(max_results, session)
         self.lang = lang
 
-    async def execute(self, query: str) -> str:
-        """异步执行搜索"""
-        def _search():
-            try:
-                import wikipedia
+    def _cache_params(self) -> tuple:
+        return (self.max_results, self.lang)
 
-                wikipedia.set_lang(self.lang)
-                results = []
+    async def _fetch(self, query: str) -> str:
+        """
+        异步执行搜索
 
-                # 搜索页面
-                search_results = wikipedia.search(query, results=self.max_results)
+        通过 MediaWiki API 的 generator=search 一次请求同时取回搜索结果
+        及各页面的摘要、URL 和分类，而不是逐页请求。
+        """
+        params = {
+            "action": "query",
+            "format": "json",
+            "formatversion": "2",
+            "generator": "search",
+            "gsrsearch": query,
+            "gsrlimit": str(self.max_results),
+            "prop": "extracts|info|categories|pageprops",
+            "exintro": "1",
+            "explaintext": "1",
+            "exlimit": "max",
+            "inprop": "url",
+            "cllimit": "max",
+            "ppprop": "disambiguation",
+            "redirects": "1",
+        }
 
-                for title in search_results:
-                    try:
-                        page = wikipedia.page(title)
-                        results.append({
-                            "type": "page",
-                            "title": page.title,
-                            "url": page.url,
-                            "content": page.summary,
-                            "categories": page.categories,
-                        })
-                    except wikipedia.exceptions.PageError:
-                        continue
-                    except wikipedia.exceptions.DisambiguationError as e:
-                        # 处理消歧义页面
-                        results.append({
-                            "type": "disambiguation",
-                            "title": title,
-                            "content": str(e),
-                        })
+        try:
+            session = await self._get_session()
+            async with session.get(
+                f"https://{self.lang}.wikipedia.org/w/api.php",
+                params=params
+            ) as response:
+                response.raise_for_status()
+                data = json_loads(await response.read())
+
+            if "error" in data:
+                raise RuntimeError(data["error"].get("info", "MediaWiki API error"))
+
+            pages = data.get("query", {}).get("pages", [])
+            # generator 返回的页面顺序不保证与搜索排名一致
+            pages.sort(key=lambda page: page.get("index", 0))
+
+            results = []
+            for page in pages:
+                if page.get("missing"):
+                    continue
+
+                if "disambiguation" in page.get("pageprops", {}):
+                    # 处理消歧义页面
+                    results.append({
+                        "type": "disambiguation",
+                        "title": page["title"],
+                        "content": page.get("extract", ""),
+                    })
+                    continue
+
+                results.append({
+                    "type": "page",
+                    "title": page["title"],
+                    "url": page.get("fullurl", ""),
+                    "content": page.get("extract", ""),
+                    "categories": [
+                        c["title"].split(":", 1)[-1] for c in page.get("categories", [])
+                    ],
+                })
 
-                return json.dumps(results, ensure_ascii=False)
+            return json_dumps(results)
 
-            except Exception as e:
-                logger.error(f"Wikipedia search error: {e}")
-                return json.dumps({"error": str(e)}, ensure_ascii=False)
+        except Exception as e:
+            logger.error(f"Wikipedia search error: {e}")
+            return json_dumps({"error": str(e)})
+
+
+@functools.lru_cache(maxsize=8)
+def _get_web_search_tool_for(max_search_results: int, search_api: str):
+    return get_web_search_tool(max_search_results)
 
-        # 在单独的线程中运行同步搜索
-        return await asyncio.to_thread(_search)
+
+def get_cached_web_search_tool(max_search_results: int = 5):
+    """
+    获取配置的搜索工具（复用已创建的实例）
+
+    按 (max_search_results, SEARCH_API 环境变量) 缓存，避免每次调用都重新读取配置、
+    创建工具实例。
+
+    Args:
+        max_search_results: 最大搜索结果数
+
+    Returns:
+        搜索工具实例
+    """
+    return _get_web_search_tool_for(max_search_results, os.environ.get("SEARCH_API", ""))
 
 
 def get_web_search_tool(max_search_results: int = 5):
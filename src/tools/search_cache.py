@@ -0,0 +1,100 @@
+"""
+搜索结果缓存
+
+LRU + TTL 缓存，并合并并发的相同查询（single-flight），
+避免同一会话内重复查询反复请求远端 API。
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+def _is_error_result(result: Any) -> bool:
+    """搜索工具以 {"error": ...} JSON 字符串表示失败，失败结果不缓存"""
+    return isinstance(result, str) and result.startswith('{"error"')
+
+
+class SearchResultCache:
+    """
+    带过期时间的 LRU 搜索结果缓存
+
+    Args:
+        maxsize: 最大缓存条目数，超出时淘汰最久未使用的条目
+        ttl: 条目有效期（秒）
+        should_cache: 判断结果是否可缓存，默认跳过错误结果
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 512,
+        ttl: float = 600.0,
+        should_cache: Optional[Callable[[Any], bool]] = None,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._should_cache = should_cache or (lambda result: not _is_error_result(result))
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        查找未过期的缓存结果
+
+        Returns:
+            (是否命中, 结果)
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, result = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, result
+
+    def set(self, key: Hashable, result: Any) -> None:
+        """写入缓存，超出容量时淘汰最久未使用的条目"""
+        self._entries[key] = (time.monotonic() + self.ttl, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def get_or_fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        命中则直接返回缓存；否则调用 fetch，并让同时到达的相同查询共享这一次调用
+
+        Args:
+            key: 缓存键（需可哈希）
+            fetch: 未命中时执行的协程工厂
+
+        Returns:
+            查询结果
+        """
+        hit, result = self.get(key)
+        if hit:
+            return result
+
+        loop = asyncio.get_running_loop()
+        task = self._inflight.get(key)
+        if task is None or task.get_loop() is not loop:
+            task = loop.create_task(self._fetch_and_store(key, fetch))
+            self._inflight[key] = task
+        # shield: 某个调用方被取消时不影响共享同一请求的其他调用方
+        return await asyncio.shield(task)
+
+    async def _fetch_and_store(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            result = await fetch()
+            if self._should_cache(result):
+                self.set(key, result)
+            return result
+        finally:
+            if self._inflight.get(key) is asyncio.current_task():
+                del self._inflight[key]
+
+    def clear(self) -> None:
+        """清空缓存"""
+        self._entries.clear()
@@ -7,7 +7,7 @@
 """
 
 import asyncio
-import json
+import functools
 import os
 import sys
 
@@ -17,7 +17,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 from src.myllms.factory import get_llm_by_type
 from src.my_agent.agent import create_my_agent
 from src.tools.search import (
-    get_web_search_tool,
+    get_cached_web_search_tool,
     TavilySearchTool,
     DuckDuckGoSearchTool,
     ArxivSearchTool,
@@ -105,7 +105,7 @@ async def example1_with_configured_search():
 
     try:
         # 获取配置好的搜索工具
-        search_tool = get_web_search_tool(max_search_results=3)
+        search_tool = get_cached_web_search_tool(max_search_results=3)
         print(f"\n✓ 获取搜索工具: {search_tool.name}")
         print(f"  工具类型: {type(search_tool).__name__}")
 
@@ -205,14 +205,17 @@ async def example3_with_decorator():
     try:
         from src.tools.decorators import tool
 
+        # 获取配置好的搜索工具（只获取一次，各次调用复用）
+        search_tool = get_cached_web_search_tool(max_search_results=3)
+
         @tool()
-        def custom_search(query: str) -> str:
+        async def custom_search(query: str) -> str:
             """自定义搜索工具"""
-            # 获取配置好的搜索工具
-            search_tool = get_web_search_tool(max_search_results=3)
-            # 执行搜索
-            result = search_tool._run(query)
-            return result
+            # 异步实现直接 await；同步实现放到线程池执行，避免阻塞事件循环
+            if asyncio.iscoroutinefunction(search_tool.execute):
+                return await search_tool.execute(query)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, functools.partial(search_tool._run, query))
 
         # 创建 Agent 并注册装饰器工具
         agent = await create_my_agent(
@@ -263,7 +266,7 @@ async def example4_manual_registration():
         )
 
         # 手动注册搜索工具
-        search_tool = get_web_search_tool(max_search_results=3)
+        search_tool = get_cached_web_search_tool(max_search_results=3)
 
         agent.register_tool_from_base_tool(search_tool)
 
@@ -309,17 +312,17 @@ async def main():
     print("运行示例")
     print("=" * 80)
 
-    # 示例 1: 配置好的搜索工具
-    await example1_with_configured_search()
-
-    # 示例 2: 特定搜索工具
-    await example2_with_specific_tool()
-
-    # 示例 3: 装饰器方式
-    await example3_with_decorator()
-
-    # 示例 4: 手动注册
-    await example4_manual_registration()
+    # 各示例互不依赖，并发运行（输出可能交错）
+    results = await asyncio.gather(
+        example1_with_configured_search(),  # 示例 1: 配置好的搜索工具
+        example2_with_specific_tool(),      # 示例 2: 特定搜索工具
+        example3_with_decorator(),          # 示例 3: 装饰器方式
+        example4_manual_registration(),     # 示例 4: 手动注册
+        return_exceptions=True,
+    )
+    for i, result in enumerate(results, 1):
+        if isinstance(result, BaseException):
+            print(f"\n❌ 示例 {i} 失败: {result}")
 
     print("\n" + "=" * 80)
     print("所有示例运行完成")
@@ -4,12 +4,28 @@ Search tools for agents
 
 import os
 import re
-import json
-from typing import Any, Dict, Optional, List
+import mmap
+import asyncio
+import functools
+import multiprocessing
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
+from typing import Any, Dict, Optional, List
 
 # Import the existing search functionality from parent directory
-from ..search import get_web_search_tool
+from ..search import get_cached_web_search_tool
+from ..search_cache import SearchResultCache, _is_error_result
+
+
+# Successful web_search responses keyed by (query, max_results); backend
+# failures come back as an '{"error": ...}' result and are not cached
+_web_search_cache = SearchResultCache(
+    maxsize=1024,
+    ttl=120.0,
+    should_cache=lambda response: response.get("success", False) and not _is_error_result(response.get("results"))
+)
 
 
 class WebSearchTool:
@@ -46,10 +62,44 @@ class WebSearchTool:
 
     @staticmethod
     async def execute(query: str, max_results: int = 10) -> Dict[str, Any]:
-        """Execute the tool"""
+        """Execute the tool
+
+        Repeated queries are answered from a short-lived cache, and concurrent
+        identical queries (including ones that end up failing) share a single
+        in-flight search. Each caller gets its own copy of the response dict, so
+        modifying it doesn't change the cached value.
+        """
+        response = await _web_search_cache.get_or_fetch(
+            (query, max_results),
+            lambda: WebSearchTool._search(query, max_results)
+        )
+        return dict(response)
+
+    @staticmethod
+    async def execute_many(queries: List[str], max_results: int = 10) -> List[Dict[str, Any]]:
+        """Execute several queries concurrently
+
+        Each query goes through execute(), so cached and in-flight queries are
+        shared and the backend rate limit still applies.
+
+        Returns:
+            One response per query, in the order of queries
+        """
+        return list(await asyncio.gather(
+            *(WebSearchTool.execute(query, max_results) for query in queries)
+        ))
+
+    @staticmethod
+    def invalidate() -> None:
+        """Drop all cached search responses"""
+        _web_search_cache.clear()
+
+    @staticmethod
+    async def _search(query: str, max_results: int) -> Dict[str, Any]:
+        """Run the search against the configured backend"""
         try:
             # Use the existing search functionality
-            search_tool = get_web_search_tool(max_results)
+            search_tool = get_cached_web_search_tool(max_results)
 
             # The tool might be sync, so handle both cases
             import inspect
@@ -72,6 +122,239 @@ class WebSearchTool:
             }
 
 
+# Syntax that lets a match look across a line break, or that bytes and
+# Hyperscan matching treat differently from a str regex: escapes (\n, \s,
+# \A, ...), character sets ([^x] matches "\n"), inline flags and lookaround
+# ((?s), (?=...)) and literal line breaks. Patterns without any of these only
+# ever match within a single line.
+_NOT_LINE_LOCAL = re.compile(r"[\\\[\n\r]|\(\?")
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_code_pattern(pattern: str):
+    """Compile a search pattern for _scan_file
+
+    Returns:
+        (regex, bytes_regex): regex is the case-insensitive str pattern.
+        bytes_regex is the same pattern compiled as bytes when it is ASCII and
+        line-local, so it can run over a whole file at once; None otherwise,
+        and the file is then searched line by line.
+        Compiled patterns are memoized, so repeated searches and per-file calls
+        skip compilation.
+    """
+    regex = re.compile(pattern, re.IGNORECASE | re.MULTILINE)
+    bytes_regex = None
+    if pattern.isascii() and not _NOT_LINE_LOCAL.search(pattern):
+        bytes_regex = re.compile(pattern.encode("ascii"), re.IGNORECASE | re.MULTILINE)
+    return regex, bytes_regex
+
+
+def _scan_buffer(buf, find, newline) -> List[Dict[str, Any]]:
+    """Collect one {"line", "content"} entry per matching line of buf
+
+    Args:
+        buf: File contents (mmap, bytes or str)
+        find: find(pos) -> offset of the next match starting at or after pos, or -1
+        newline: Newline of the same type as buf
+    """
+    # Most files don't match at all; reject them with a single C-level scan
+    start = find(0)
+    if start < 0:
+        return []
+
+    matches = []
+    line_no, counted_to = 1, 0
+    while start >= 0:
+        line_start = buf.rfind(newline, 0, start) + 1
+        line_end = buf.find(newline, start)
+        if line_end == -1:
+            line_end = len(buf)
+
+        line_no += buf[counted_to:line_start].count(newline)
+        counted_to = line_start
+
+        line = buf[line_start:line_end]
+        if isinstance(line, bytes):
+            line = line.decode('ascii')
+        matches.append({
+            "line": line_no,
+            "content": line.strip()
+        })
+
+        # One entry per line: continue from the start of the next line
+        if line_end >= len(buf):
+            break
+        start = find(line_end + 1)
+
+    return matches
+
+
+def _regex_finder(regex, buf):
+    def find(pos: int) -> int:
+        m = regex.search(buf, pos)
+        return m.start() if m is not None else -1
+    return find
+
+
+@functools.lru_cache(maxsize=None)
+def _get_hyperscan():
+    """Import hyperscan on first use; None when it isn't installed"""
+    try:
+        import hyperscan
+    except ImportError:
+        return None
+    return hyperscan
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_hyperscan(pattern: str):
+    """Hyperscan database for a pattern that has a bytes_regex
+
+    Returns None when hyperscan isn't installed or can't compile the pattern
+    (possessive repeats, patterns matching the empty string), in which case the
+    caller falls back to re. Repeat braces ("{,n}", a literal "{") mean
+    something else to Hyperscan than to re, so those patterns use re too.
+    """
+    if "{" in pattern:
+        return None
+    hyperscan = _get_hyperscan()
+    if hyperscan is None:
+        return None
+    db = hyperscan.Database()
+    try:
+        db.compile(
+            expressions=[pattern.encode("ascii")],
+            ids=[0],
+            flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_MULTILINE | hyperscan.HS_FLAG_SOM_LEFTMOST]
+        )
+    except hyperscan.error:
+        return None
+    return db
+
+
+def _hyperscan_finder(db, buf):
+    """Scan buf once with db and answer find(pos) from the collected match starts"""
+    starts = []
+
+    def on_match(id_, start, end, flags, context):
+        # Every end offset of a match is reported; keep each start once
+        if not starts or starts[-1] != start:
+            starts.append(start)
+
+    db.scan(buf, match_event_handler=on_match)
+    # Matches arrive in end-offset order
+    starts.sort()
+
+    def find(pos: int) -> int:
+        i = bisect_left(starts, pos)
+        return starts[i] if i < len(starts) else -1
+    return find
+
+
+# Files the byte-level searches read exactly as text mode does: pure ASCII
+# without "\r" (text mode turns "\r\n" and lone "\r" into "\n")
+_NOT_PLAIN_ASCII = re.compile(rb"[\x80-\xff\r]")
+
+
+def _scan_file(filepath: str, pattern: str) -> List[Dict[str, Any]]:
+    """Return one {"line", "content"} entry per line of filepath matching pattern
+
+    Matches are the lines on which the case-insensitive pattern is found, with
+    the file read in text mode. Line-local patterns run over the whole file,
+    on the raw bytes when the file is plain ASCII.
+    """
+    regex, bytes_regex = _compile_code_pattern(pattern)
+    with open(filepath, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty file: a single empty line
+            return [{"line": 1, "content": ""}] if regex.search("") else []
+    with mm:
+        if bytes_regex is not None and _NOT_PLAIN_ASCII.search(mm) is None:
+            if re.escape(pattern) == pattern:
+                # Plain literal: substring search on a lower-cased copy
+                # (ASCII lowering keeps offsets, so lines are still read from mm)
+                needle = pattern.lower().encode("ascii")
+                lowered = mm[:].lower()
+                return _scan_buffer(mm, lambda pos: lowered.find(needle, pos), b"\n")
+            db = _compile_hyperscan(pattern)
+            if db is not None:
+                return _scan_buffer(mm, _hyperscan_finder(db, mm), b"\n")
+            return _scan_buffer(mm, _regex_finder(bytes_regex, mm), b"\n")
+        # Decode like text mode: UTF-8 ignoring errors, universal newlines
+        text = mm[:].decode('utf-8', errors='ignore').replace('\r\n', '\n').replace('\r', '\n')
+
+    if bytes_regex is not None:
+        return _scan_buffer(text, _regex_finder(regex, text), "\n")
+    return [
+        {"line": i, "content": line.strip()}
+        for i, line in enumerate(text.split('\n'), 1)
+        if regex.search(line)
+    ]
+
+
+def _scan_chunk(filepaths: List[str], pattern: str) -> List[Dict[str, Any]]:
+    """Scan a batch of files, skipping those that can't be read"""
+    results = []
+    for filepath in filepaths:
+        try:
+            matches = _scan_file(filepath, pattern)
+        except Exception:
+            continue
+        if matches:
+            results.append({
+                "file": filepath,
+                "matches": matches
+            })
+    return results
+
+
+# Files per process-pool task (amortizes IPC); searches of up to
+# _POOL_MIN_FILES files stay in a thread
+_SCAN_CHUNK_SIZE = 32
+_POOL_MIN_FILES = 256
+_scan_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_scan_pool() -> ProcessPoolExecutor:
+    global _scan_pool
+    if _scan_pool is None:
+        # spawn: forking this multi-threaded process could copy held locks into the workers
+        _scan_pool = ProcessPoolExecutor(
+            max_workers=os.cpu_count(), mp_context=multiprocessing.get_context("spawn")
+        )
+    return _scan_pool
+
+
+async def _scan_files(filepaths: List[str], pattern: str) -> List[Dict[str, Any]]:
+    """Scan files off the event loop, spreading large searches over a process pool"""
+    global _scan_pool
+    loop = asyncio.get_running_loop()
+    if len(filepaths) <= _POOL_MIN_FILES:
+        return await loop.run_in_executor(None, _scan_chunk, filepaths, pattern)
+
+    chunks = [filepaths[i:i + _SCAN_CHUNK_SIZE] for i in range(0, len(filepaths), _SCAN_CHUNK_SIZE)]
+    pool = _get_scan_pool()
+    broken = False
+    try:
+        chunk_results = await asyncio.gather(
+            *(loop.run_in_executor(pool, _scan_chunk, chunk, pattern) for chunk in chunks)
+        )
+    except BrokenProcessPool:
+        broken = True
+    finally:
+        if broken:
+            # A worker died; release the pool before dropping it
+            pool.shutdown(wait=False, cancel_futures=True)
+            if _scan_pool is pool:
+                _scan_pool = None
+    if broken:
+        # Finish in a thread
+        return await loop.run_in_executor(None, _scan_chunk, filepaths, pattern)
+    return [result for results in chunk_results for result in results]
+
+
 class CodeSearchTool:
     """Tool for searching code files"""
 
@@ -117,37 +400,17 @@ class CodeSearchTool:
             extensions = [".py"]
 
         try:
-            results = []
-            pattern_regex = re.compile(pattern, re.IGNORECASE)
+            # Validate the pattern up front so a bad regex is reported, not skipped per file
+            _compile_code_pattern(pattern)
+            suffixes = tuple(extensions)
 
+            filepaths = []
             for root, dirs, files in os.walk(path):
                 # Skip hidden directories
                 dirs[:] = [d for d in dirs if not d.startswith('.')]
+                filepaths.extend(os.path.join(root, file) for file in files if file.endswith(suffixes))
 
-                for file in files:
-                    if any(file.endswith(ext) for ext in extensions):
-                        filepath = os.path.join(root, file)
-                        try:
-                            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                                content = f.read()
-
-                                # Search for matches
-                                matches = []
-                                for i, line in enumerate(content.split('\n'), 1):
-                                    if pattern_regex.search(line):
-                                        matches.append({
-                                            "line": i,
-                                            "content": line.strip()
-                                        })
-
-                                if matches:
-                                    results.append({
-                                        "file": filepath,
-                                        "matches": matches
-                                    })
-                        except Exception as e:
-                            # Skip files that can't be read
-                            continue
+            results = await _scan_files(filepaths, pattern)
 
             return {
                 "success": True,
@@ -163,6 +426,23 @@ class CodeSearchTool:
             }
 
 
+def _scandir_recursive(path: str):
+    """Yield file entries under path depth-first, without following directory symlinks"""
+    try:
+        with os.scandir(path) as it:
+            entries = list(it)
+    except OSError:
+        return
+    for entry in entries:
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _scandir_recursive(entry.path)
+            elif entry.is_file():
+                yield entry
+        except OSError:
+            continue
+
+
 class DocumentSearchTool:
     """Tool for searching within documents"""
 
@@ -208,22 +488,27 @@ class DocumentSearchTool:
             file_types = ["pdf", "docx", "txt"]
 
         try:
-            results = []
-            path_obj = Path(path)
+            # Report paths the way str(Path(path) / name) does: the root in
+            # pathlib's normal form and no leading "./" under the current directory
+            root = str(Path(path))
+            strip = len(os.curdir + os.sep) if root == os.curdir else 0
+            # Lower-cased suffix (with dot) and matches for each requested file type
+            suffixes = [("." + file_type.lower(), file_type, []) for file_type in file_types]
 
-            # Find documents
-            for file_type in file_types:
-                for filepath in path_obj.rglob(f"*.{file_type}"):
-                    try:
+            # Find documents in a single walk, whatever the number of file types
+            for entry in _scandir_recursive(root):
+                name = entry.name.lower()
+                for suffix, file_type, found in suffixes:
+                    if name.endswith(suffix):
                         # For now, just return file path
                         # In real implementation, you would extract and search content
-                        results.append({
-                            "file": str(filepath),
+                        found.append({
+                            "file": entry.path[strip:],
                             "type": file_type,
                             "status": "Found file"
                         })
-                    except Exception as e:
-                        continue
+
+            results = [match for _, _, found in suffixes for match in found]
 
             return {
                 "success": True,
@@ -6,10 +6,188 @@ import os
 import sys
 import subprocess
 import platform
+import functools
+import io
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, Optional
 import asyncio
 
 
+# Keep at most this many trailing bytes of each command output stream
+_MAX_OUTPUT_BYTES = 1024 * 1024
+_READ_CHUNK_SIZE = 64 * 1024
+
+
+class _OutputBuffer:
+    """Byte-bounded buffer keeping only the tail of a stream"""
+
+    def __init__(self, max_bytes: int = _MAX_OUTPUT_BYTES):
+        self.max_bytes = max_bytes
+        self.chunks: deque = deque()
+        self.size = 0
+
+    def append(self, chunk: bytes) -> None:
+        self.chunks.append(chunk)
+        self.size += len(chunk)
+        while self.size - len(self.chunks[0]) >= self.max_bytes:
+            self.size -= len(self.chunks.popleft())
+
+    def text(self) -> str:
+        data = b"".join(self.chunks)
+        if len(data) > self.max_bytes:
+            data = data[-self.max_bytes:]
+        return data.decode('utf-8', errors='ignore')
+
+
+async def _drain(stream: asyncio.StreamReader, buffer: _OutputBuffer) -> None:
+    """Read a stream to EOF into buffer"""
+    while True:
+        chunk = await stream.read(_READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        buffer.append(chunk)
+
+
+@functools.lru_cache(maxsize=512)
+def _compile_code(code: str, filename: str):
+    """Compile source once per (code, filename); retried snippets reuse the code object"""
+    return compile(code, filename, 'exec')
+
+
+class _ThreadLocalStream:
+    """sys.stdout/sys.stderr proxy that sends writes from capturing threads to their own buffer
+
+    contextlib.redirect_stdout swaps the process-wide stream, which would mix
+    output of code running concurrently in different threads. Threads started
+    by the executed code inherit their starter's buffer; every other thread,
+    including the event loop's, keeps writing to the original stream.
+    """
+
+    def __init__(self, default):
+        self._default = default
+        self._local = threading.local()
+        # Threads started during a capture -> the buffer they inherited
+        self._inherited = weakref.WeakKeyDictionary()
+
+    def capture_target(self):
+        """Return the buffer capturing the current thread, or None"""
+        target = getattr(self._local, "target", None)
+        if target is None and self._inherited:
+            target = self._inherited.get(threading.current_thread())
+        return target
+
+    def _target(self):
+        target = self.capture_target()
+        return self._default if target is None else target
+
+    def begin(self, target) -> None:
+        self._local.target = target
+
+    def end(self, target) -> None:
+        self._local.target = None
+        for thread, inherited in list(self._inherited.items()):
+            if inherited is target:
+                del self._inherited[thread]
+
+    def inherit(self, thread: threading.Thread) -> None:
+        """Send writes from thread to the current thread's buffer, if any"""
+        target = self.capture_target()
+        if target is not None:
+            self._inherited[thread] = target
+
+    def write(self, s):
+        return self._target().write(s)
+
+    def flush(self):
+        return self._target().flush()
+
+    def __getattr__(self, name):
+        return getattr(self._target(), name)
+
+
+_capture_lock = threading.Lock()
+# (stdout proxy, stderr proxy) while any capture is running, None otherwise
+_proxies = None
+_capture_count = 0
+_thread_start = threading.Thread.start
+
+
+def _start_thread(self):
+    """Thread.start used while captures run: the new thread inherits its starter's buffers"""
+    with _capture_lock:
+        if _proxies is not None:
+            for proxy in _proxies:
+                proxy.inherit(self)
+    return _thread_start(self)
+
+
+def _begin_capture(stdout_target, stderr_target):
+    """Route this thread's sys.stdout/sys.stderr writes to the given buffers
+
+    The proxies are installed by the first active capture and removed again by
+    the last one, so the original streams are back in place between runs.
+    """
+    global _proxies, _capture_count
+    with _capture_lock:
+        if _proxies is None:
+            _proxies = (_ThreadLocalStream(sys.stdout), _ThreadLocalStream(sys.stderr))
+            sys.stdout, sys.stderr = _proxies
+            threading.Thread.start = _start_thread
+        _capture_count += 1
+        _proxies[0].begin(stdout_target)
+        _proxies[1].begin(stderr_target)
+        return _proxies
+
+
+def _end_capture(proxies, stdout_target, stderr_target) -> None:
+    """Undo _begin_capture, restoring the original streams after the last capture"""
+    global _proxies, _capture_count
+    with _capture_lock:
+        proxies[0].end(stdout_target)
+        proxies[1].end(stderr_target)
+        _capture_count -= 1
+        if _capture_count == 0:
+            # Leave the streams alone if the executed code replaced them itself
+            if sys.stdout is proxies[0]:
+                sys.stdout = proxies[0]._default
+            if sys.stderr is proxies[1]:
+                sys.stderr = proxies[1]._default
+            if threading.Thread.start is _start_thread:
+                threading.Thread.start = _thread_start
+            _proxies = None
+
+
+def _run_code(code: str, namespace: Dict[str, Any]):
+    """Execute code capturing this thread's output
+
+    Returns:
+        (success, error, stdout_text, stderr_text)
+    """
+    stdout_capture = io.StringIO()
+    stderr_capture = io.StringIO()
+
+    proxies = _begin_capture(stdout_capture, stderr_capture)
+    try:
+        exec(_compile_code(code, namespace['__file__']), namespace)
+        success = True
+        error = None
+    except Exception as e:
+        success = False
+        error = str(e)
+    finally:
+        _end_capture(proxies, stdout_capture, stderr_capture)
+
+    return success, error, stdout_capture.getvalue(), stderr_capture.getvalue()
+
+
+# Bounds how many python_execute calls run at once
+_CODE_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="python_execute")
+
+
 class BashTool:
     """Tool for executing bash commands"""
 
@@ -50,6 +228,7 @@ class BashTool:
     @staticmethod
     async def execute(command: str, cwd: Optional[str] = None, timeout: int = 30) -> Dict[str, Any]:
         """Execute the tool"""
+        stdout_buffer, stderr_buffer = _OutputBuffer(), _OutputBuffer()
         try:
             # Run command
             process = await asyncio.create_subprocess_shell(
@@ -59,30 +238,35 @@ class BashTool:
                 cwd=cwd
             )
 
-            # Wait for completion with timeout
-            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
-
-            # Decode output
-            stdout_text = stdout.decode('utf-8', errors='ignore')
-            stderr_text = stderr.decode('utf-8', errors='ignore')
+            # Stream output into bounded buffers while waiting, with timeout
+            readers = asyncio.gather(
+                _drain(process.stdout, stdout_buffer),
+                _drain(process.stderr, stderr_buffer)
+            )
+            await asyncio.wait_for(asyncio.shield(readers), timeout=timeout)
+            await process.wait()
 
             return {
                 "success": process.returncode == 0,
                 "returncode": process.returncode,
-                "stdout": stdout_text,
-                "stderr": stderr_text,
+                "stdout": stdout_buffer.text(),
+                "stderr": stderr_buffer.text(),
                 "command": command
             }
         except asyncio.TimeoutError:
             # Kill the process if it times out
             try:
                 process.kill()
+                await process.wait()
             except:
                 pass
+            readers.cancel()
 
             return {
                 "success": False,
                 "error": f"Command timed out after {timeout} seconds",
+                "stdout": stdout_buffer.text(),
+                "stderr": stderr_buffer.text(),
                 "command": command
             }
         except Exception as e:
@@ -134,27 +318,11 @@ class PythonExecuteTool:
                 '__file__': file_path or '<string>'
             }
 
-            # Capture output
-            import io
-            import contextlib
-
-            stdout_capture = io.StringIO()
-            stderr_capture = io.StringIO()
-
-            # Execute code with output capture
-            with contextlib.redirect_stdout(stdout_capture), \
-                 contextlib.redirect_stderr(stderr_capture):
-                try:
-                    exec(code, namespace)
-                    success = True
-                    error = None
-                except Exception as e:
-                    success = False
-                    error = str(e)
-
-            # Get captured output
-            stdout_text = stdout_capture.getvalue()
-            stderr_text = stderr_capture.getvalue()
+            # Execute code with output capture off the event loop
+            loop = asyncio.get_running_loop()
+            success, error, stdout_text, stderr_text = await loop.run_in_executor(
+                _CODE_POOL, _run_code, code, namespace
+            )
 
             return {
                 "success": success,
@@ -171,6 +339,61 @@ class PythonExecuteTool:
             }
 
 
+@functools.lru_cache(maxsize=None)
+def _os_info() -> Dict[str, str]:
+    """Platform details are fixed for the process lifetime (processor() may spawn a subprocess)"""
+    return {
+        "system": platform.system(),
+        "release": platform.release(),
+        "version": platform.version(),
+        "machine": platform.machine(),
+        "processor": platform.processor()
+    }
+
+
+# Disk/memory usage changes, but not meaningfully within a few seconds
+_USAGE_TTL = 5.0
+_usage_cache: Dict[str, Any] = {}
+
+
+def _cached_usage(kind: str, probe) -> Any:
+    """Return probe() result, reusing a value younger than _USAGE_TTL seconds
+
+    Dict results are returned as copies so callers can't modify the cached value.
+    """
+    now = time.monotonic()
+    entry = _usage_cache.get(kind)
+    if entry is not None and now - entry[0] < _USAGE_TTL:
+        value = entry[1]
+    else:
+        value = probe()
+        _usage_cache[kind] = (now, value)
+    return dict(value) if isinstance(value, dict) else value
+
+
+def _disk_usage() -> Dict[str, int]:
+    import shutil
+    disk_usage = shutil.disk_usage(".")
+    return {
+        "total": disk_usage.total,
+        "used": disk_usage.used,
+        "free": disk_usage.free
+    }
+
+
+def _memory_usage() -> Any:
+    try:
+        import psutil
+    except ImportError:
+        return "psutil not installed"
+    memory = psutil.virtual_memory()
+    return {
+        "total": memory.total,
+        "available": memory.available,
+        "percent": memory.percent
+    }
+
+
 class SystemInfoTool:
     """Tool for getting system information"""
 
@@ -206,13 +429,7 @@ class SystemInfoTool:
             result = {}
 
             if info_type in ["os", "all"]:
-                result["os"] = {
-                    "system": platform.system(),
-                    "release": platform.release(),
-                    "version": platform.version(),
-                    "machine": platform.machine(),
-                    "processor": platform.processor()
-                }
+                result["os"] = dict(_os_info())
 
             if info_type in ["python", "all"]:
                 result["python"] = {
@@ -230,25 +447,10 @@ class SystemInfoTool:
                 result["environment"] = env_vars
 
             if info_type in ["disk", "all"]:
-                import shutil
-                disk_usage = shutil.disk_usage(".")
-                result["disk"] = {
-                    "total": disk_usage.total,
-                    "used": disk_usage.used,
-                    "free": disk_usage.free
-                }
+                result["disk"] = _cached_usage("disk", _disk_usage)
 
             if info_type in ["memory", "all"]:
-                try:
-                    import psutil
-                    memory = psutil.virtual_memory()
-                    result["memory"] = {
-                        "total": memory.total,
-                        "available": memory.available,
-                        "percent": memory.percent
-                    }
-                except ImportError:
-                    result["memory"] = "psutil not installed"
+                result["memory"] = _cached_usage("memory", _memory_usage)
 
             return {
                 "success": True,
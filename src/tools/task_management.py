@@ -12,30 +12,34 @@ from src.tools import BaseTool
 class CreateTaskTool(BaseTool):
     """Create a new task"""
 
-    def get_schema(self):
-        return {
-            "type": "function",
-            "function": {
-                "name": "create_task",
-                "description": "Create a new task",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "title": {"type": "string", "description": "Task title"},
-                        "description": {"type": "string", "description": "Task description"},
-                        "assignee": {"type": "string", "description": "Task assignee"},
-                        "priority": {"type": "string", "enum": ["low", "medium", "high"], "description": "Task priority"},
-                        "tags": {"type": "array", "items": {"type": "string"}, "description": "Task tags"}
-                    },
-                    "required": ["title", "description"]
-                }
+    _SCHEMA = {
+        "type": "function",
+        "function": {
+            "name": "create_task",
+            "description": "Create a new task",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "title": {"type": "string", "description": "Task title"},
+                    "description": {"type": "string", "description": "Task description"},
+                    "assignee": {"type": "string", "description": "Task assignee"},
+                    "priority": {"type": "string", "enum": ["low", "medium", "high"], "description": "Task priority"},
+                    "tags": {"type": "array", "items": {"type": "string"}, "description": "Task tags"}
+                },
+                "required": ["title", "description"]
             }
         }
+    }
+
+    def get_schema(self):
+        return self._SCHEMA
 
     def execute(self, title: str, description: str, assignee: Optional[str] = None,
                 priority: str = "medium", tags: Optional[List[str]] = None) -> Dict[str, Any]:
         """Execute task creation"""
-        task_id = str(uuid.uuid4())
+        task_id = uuid.uuid4().hex
+        # A new task is created and last updated at the same moment
+        now = datetime.now().isoformat()
 
         task = {
             "id": task_id,
@@ -45,8 +49,8 @@ class CreateTaskTool(BaseTool):
             "priority": priority,
             "status": "pending",
             "tags": tags or [],
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat()
+            "created_at": now,
+            "updated_at": now
         }
 
         return {
@@ -59,23 +63,25 @@ class CreateTaskTool(BaseTool):
 class AssignTaskTool(BaseTool):
     """Assign a task to a team member"""
 
-    def get_schema(self):
-        return {
-            "type": "function",
-            "function": {
-                "name": "assign_task",
-                "description": "Assign a task to a team member",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "task_id": {"type": "string", "description": "Task ID"},
-                        "assignee": {"type": "string", "description": "Assignee name"},
-                        "notes": {"type": "string", "description": "Assignment notes"}
-                    },
-                    "required": ["task_id", "assignee"]
-                }
+    _SCHEMA = {
+        "type": "function",
+        "function": {
+            "name": "assign_task",
+            "description": "Assign a task to a team member",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "task_id": {"type": "string", "description": "Task ID"},
+                    "assignee": {"type": "string", "description": "Assignee name"},
+                    "notes": {"type": "string", "description": "Assignment notes"}
+                },
+                "required": ["task_id", "assignee"]
             }
         }
+    }
+
+    def get_schema(self):
+        return self._SCHEMA
 
     def execute(self, task_id: str, assignee: str, notes: Optional[str] = None) -> Dict[str, Any]:
         """Execute task assignment"""
@@ -91,23 +97,25 @@ class AssignTaskTool(BaseTool):
 class UpdateTaskStatusTool(BaseTool):
     """Update task status"""
 
-    def get_schema(self):
-        return {
-            "type": "function",
-            "function": {
-                "name": "update_task_status",
-                "description": "Update the status of a task",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "task_id": {"type": "string", "description": "Task ID"},
-                        "status": {"type": "string", "enum": ["pending", "in_progress", "completed", "failed"], "description": "New status"},
-                        "notes": {"type": "string", "description": "Status update notes"}
-                    },
-                    "required": ["task_id", "status"]
-                }
+    _SCHEMA = {
+        "type": "function",
+        "function": {
+            "name": "update_task_status",
+            "description": "Update the status of a task",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "task_id": {"type": "string", "description": "Task ID"},
+                    "status": {"type": "string", "enum": ["pending", "in_progress", "completed", "failed"], "description": "New status"},
+                    "notes": {"type": "string", "description": "Status update notes"}
+                },
+                "required": ["task_id", "status"]
             }
         }
+    }
+
+    def get_schema(self):
+        return self._SCHEMA
 
     def execute(self, task_id: str, status: str, notes: Optional[str] = None) -> Dict[str, Any]:
         """Execute status update"""
@@ -124,28 +132,30 @@ class UpdateTaskStatusTool(BaseTool):
 class CreateCodingPlanTool(BaseTool):
     """Create a coding plan with multiple tasks"""
 
-    def get_schema(self):
-        return {
-            "type": "function",
-            "function": {
-                "name": "create_coding_plan",
-                "description": "Create a coding plan with tasks",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "plan_title": {"type": "string", "description": "Plan title"},
-                        "architecture_summary": {"type": "string", "description": "Architecture summary"},
-                        "tasks": {"type": "array", "items": {"type": "object"}, "description": "List of tasks"}
-                    },
-                    "required": ["plan_title", "architecture_summary", "tasks"]
-                }
+    _SCHEMA = {
+        "type": "function",
+        "function": {
+            "name": "create_coding_plan",
+            "description": "Create a coding plan with tasks",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "plan_title": {"type": "string", "description": "Plan title"},
+                    "architecture_summary": {"type": "string", "description": "Architecture summary"},
+                    "tasks": {"type": "array", "items": {"type": "object"}, "description": "List of tasks"}
+                },
+                "required": ["plan_title", "architecture_summary", "tasks"]
             }
         }
+    }
+
+    def get_schema(self):
+        return self._SCHEMA
 
     def execute(self, plan_title: str, architecture_summary: str,
                 tasks: List[Dict]) -> Dict[str, Any]:
         """Execute coding plan creation"""
-        plan_id = str(uuid.uuid4())
+        plan_id = uuid.uuid4().hex
 
         plan = {
             "id": plan_id,
@@ -166,21 +176,23 @@ class CreateCodingPlanTool(BaseTool):
 class GenerateProgressReportTool(BaseTool):
     """Generate a progress report for tasks"""
 
-    def get_schema(self):
-        return {
-            "type": "function",
-            "function": {
-                "name": "generate_progress_report",
-                "description": "Generate a progress report",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "task_ids": {"type": "array", "items": {"type": "string"}, "description": "List of task IDs"},
-                        "include_details": {"type": "boolean", "description": "Include detailed task information"}
-                    }
+    _SCHEMA = {
+        "type": "function",
+        "function": {
+            "name": "generate_progress_report",
+            "description": "Generate a progress report",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "task_ids": {"type": "array", "items": {"type": "string"}, "description": "List of task IDs"},
+                    "include_details": {"type": "boolean", "description": "Include detailed task information"}
                 }
             }
         }
+    }
+
+    def get_schema(self):
+        return self._SCHEMA
 
     def execute(self, task_ids: Optional[List[str]] = None,
                 include_details: bool = True) -> Dict[str, Any]:
@@ -207,29 +219,31 @@ class GenerateProgressReportTool(BaseTool):
 class CreateTaskListTool(BaseTool):
     """Create a todo list"""
 
-    def get_schema(self):
-        return {
-            "type": "function",
-            "function": {
-                "name": "create_task_list",
-                "description": "Create a task list or todo list",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "title": {"type": "string", "description": "List title"},
-                        "tasks": {"type": "array", "items": {"type": "object"}, "description": "List of tasks"},
-                        "category": {"type": "string", "description": "Task category"}
-                    },
-                    "required": ["title", "tasks"]
-                }
+    _SCHEMA = {
+        "type": "function",
+        "function": {
+            "name": "create_task_list",
+            "description": "Create a task list or todo list",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "title": {"type": "string", "description": "List title"},
+                    "tasks": {"type": "array", "items": {"type": "object"}, "description": "List of tasks"},
+                    "category": {"type": "string", "description": "Task category"}
+                },
+                "required": ["title", "tasks"]
             }
         }
+    }
+
+    def get_schema(self):
+        return self._SCHEMA
 
     def execute(self, title: str, tasks: List[Dict],
                 category: Optional[str] = None) -> Dict[str, Any]:
         """Execute task list creation"""
         task_list = {
-            "id": str(uuid.uuid4()),
+            "id": uuid.uuid4().hex,
             "title": title,
             "category": category,
             "tasks": tasks,
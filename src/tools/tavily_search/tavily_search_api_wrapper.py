@@ -1,19 +1,23 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
-import json
+import functools
 import os
 from typing import Dict, List, Optional
 
-import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
 
 from src.config import load_yaml_config
+from src.tools.json_utils import dumps_bytes as json_dumps_bytes, loads as json_loads
+from src.tools.search import get_http_session
 from src.tools.search_postprocessor import SearchResultPostProcessor
 
 # Tavily API URL
 TAVILY_API_URL = "https://api.tavily.com"
 
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
 
 def get_search_config():
     """获取搜索配置"""
@@ -22,6 +26,16 @@ def get_search_config():
     return search_config
 
 
+@functools.lru_cache(maxsize=1)
+def _get_postprocessor() -> SearchResultPostProcessor:
+    """获取按搜索配置构建的后处理器（配置在进程内不变，只构建一次）"""
+    search_config = get_search_config()
+    return SearchResultPostProcessor(
+        min_score_threshold=search_config.get("min_score_threshold"),
+        max_content_length_per_page=search_config.get("max_content_length_per_page"),
+    )
+
+
 class EnhancedTavilySearchAPIWrapper:
     """Tavily 搜索 API 包装器"""
 
@@ -32,14 +46,47 @@ class EnhancedTavilySearchAPIWrapper:
             api_key: Tavily API 密钥，如果未提供则从环境变量获取
         """
         self.api_key = api_key or os.getenv("TAVILY_API_KEY", "")
+        # 复用连接，避免每次查询都重新建立 TCP/TLS 连接
+        self._session = requests.Session()
+        self._session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20))
+
+    def close(self) -> None:
+        """关闭同步查询复用的连接（异步查询使用 search 模块的共享会话，由 close_http_session 关闭）"""
+        self._session.close()
+
+    def _build_params(
+        self,
+        query: str,
+        max_results: Optional[int],
+        search_depth: Optional[str],
+        include_domains: Optional[List[str]],
+        exclude_domains: Optional[List[str]],
+        include_answer: Optional[bool],
+        include_raw_content: Optional[bool],
+        include_images: Optional[bool],
+        include_image_descriptions: Optional[bool],
+    ) -> Dict:
+        """构建同步/异步查询共用的请求参数，未指定的域名列表发送为空列表"""
+        return {
+            "api_key": self.api_key,
+            "query": query,
+            "max_results": max_results,
+            "search_depth": search_depth,
+            "include_domains": include_domains or (),
+            "exclude_domains": exclude_domains or (),
+            "include_answer": include_answer,
+            "include_raw_content": include_raw_content,
+            "include_images": include_images,
+            "include_image_descriptions": include_image_descriptions,
+        }
 
     def raw_results(
         self,
         query: str,
         max_results: Optional[int] = 5,
         search_depth: Optional[str] = "advanced",
-        include_domains: Optional[List[str]] = [],
-        exclude_domains: Optional[List[str]] = [],
+        include_domains: Optional[List[str]] = None,
+        exclude_domains: Optional[List[str]] = None,
         include_answer: Optional[bool] = False,
         include_raw_content: Optional[bool] = False,
         include_images: Optional[bool] = False,
@@ -61,33 +108,33 @@ class EnhancedTavilySearchAPIWrapper:
         Returns:
             原始搜索结果字典
         """
-        params = {
-            "api_key": self.api_key,
-            "query": query,
-            "max_results": max_results,
-            "search_depth": search_depth,
-            "include_domains": include_domains,
-            "exclude_domains": exclude_domains,
-            "include_answer": include_answer,
-            "include_raw_content": include_raw_content,
-            "include_images": include_images,
-            "include_image_descriptions": include_image_descriptions,
-        }
+        params = self._build_params(
+            query,
+            max_results,
+            search_depth,
+            include_domains,
+            exclude_domains,
+            include_answer,
+            include_raw_content,
+            include_images,
+            include_image_descriptions,
+        )
 
-        response = requests.post(
+        response = self._session.post(
             f"{TAVILY_API_URL}/search",
-            json=params,
+            data=json_dumps_bytes(params),
+            headers=_JSON_HEADERS,
         )
         response.raise_for_status()
-        return response.json()
+        return json_loads(response.content)
 
     async def raw_results_async(
         self,
         query: str,
         max_results: Optional[int] = 5,
         search_depth: Optional[str] = "advanced",
-        include_domains: Optional[List[str]] = [],
-        exclude_domains: Optional[List[str]] = [],
+        include_domains: Optional[List[str]] = None,
+        exclude_domains: Optional[List[str]] = None,
         include_answer: Optional[bool] = False,
         include_raw_content: Optional[bool] = False,
         include_images: Optional[bool] = False,
@@ -109,30 +156,24 @@ class EnhancedTavilySearchAPIWrapper:
         Returns:
             原始搜索结果字典
         """
-        params = {
-            "api_key": self.api_key,
-            "query": query,
-            "max_results": max_results,
-            "search_depth": search_depth,
-            "include_domains": include_domains,
-            "exclude_domains": exclude_domains,
-            "include_answer": include_answer,
-            "include_raw_content": include_raw_content,
-            "include_images": include_images,
-            "include_image_descriptions": include_image_descriptions,
-        }
-
-        async def fetch() -> str:
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                async with session.post(f"{TAVILY_API_URL}/search", json=params) as res:
-                    if res.status == 200:
-                        data = await res.text()
-                        return data
-                    else:
-                        raise Exception(f"Error {res.status}: {res.reason}")
+        params = self._build_params(
+            query,
+            max_results,
+            search_depth,
+            include_domains,
+            exclude_domains,
+            include_answer,
+            include_raw_content,
+            include_images,
+            include_image_descriptions,
+        )
 
-        results_json_str = await fetch()
-        return json.loads(results_json_str)
+        session = await get_http_session()
+        async with session.post(f"{TAVILY_API_URL}/search", json=params) as res:
+            if res.status != 200:
+                raise Exception(f"Error {res.status}: {res.reason}")
+            # 直接从响应字节解析，省去中间的 str 解码
+            return json_loads(await res.read())
 
     def clean_results_with_images(
         self, raw_results: Dict[str, List[Dict]]
@@ -145,39 +186,35 @@ class EnhancedTavilySearchAPIWrapper:
         Returns:
             清理后的结果列表
         """
-        results = raw_results.get("results", [])
-        clean_results = []
+        postprocessor = _get_postprocessor()
+        # 低于分数阈值的网页会被后处理器丢弃，构建时直接跳过
+        threshold = postprocessor.min_score_threshold or 0.0
 
         # 处理网页结果
-        for result in results:
-            clean_result = {
+        clean_results = [
+            {
                 "type": "page",
                 "title": result.get("title", ""),
                 "url": result.get("url", ""),
                 "content": result.get("content", ""),
                 "score": result.get("score", 0.0),
+                **({"raw_content": result["raw_content"]} if result.get("raw_content") else {}),
             }
-            if result.get("raw_content"):
-                clean_result["raw_content"] = result["raw_content"]
-            clean_results.append(clean_result)
+            for result in raw_results.get("results", ())
+            if threshold <= 0 or result.get("score", 0.0) >= threshold
+        ]
 
         # 处理图片结果
-        images = raw_results.get("images", [])
-        for image in images:
-            clean_result = {
+        clean_results.extend(
+            {
                 "type": "image_url",
                 "image_url": {"url": image.get("url", "")},
                 "image_description": image.get("description", ""),
             }
-            clean_results.append(clean_result)
+            for image in raw_results.get("images", ())
+        )
 
         # 应用后处理器
-        search_config = get_search_config()
-        clean_results = SearchResultPostProcessor(
-            min_score_threshold=search_config.get("min_score_threshold"),
-            max_content_length_per_page=search_config.get(
-                "max_content_length_per_page"
-            ),
-        ).process_results(clean_results)
+        clean_results = postprocessor.process_results(clean_results)
 
         return clean_results
@@ -1,11 +1,11 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
-import json
 import logging
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from src.tools.decorators import BaseTool
+from src.tools.json_utils import dumps as json_dumps
 from src.tools.tavily_search.tavily_search_api_wrapper import (
     EnhancedTavilySearchAPIWrapper,
 )
@@ -95,8 +95,9 @@ class TavilySearchWithImages(BaseTool):
         """
         super().__init__()
         self.max_results = max_results
-        self.include_domains = include_domains or []
-        self.exclude_domains = exclude_domains or []
+        # 不可变元组：未指定时共享空元组，按 JSON 数组发送
+        self.include_domains = tuple(include_domains) if include_domains else ()
+        self.exclude_domains = tuple(exclude_domains) if exclude_domains else ()
         self.include_answer = include_answer
         self.search_depth = search_depth
         self.include_raw_content = include_raw_content
@@ -104,6 +105,46 @@ class TavilySearchWithImages(BaseTool):
         self.include_image_descriptions = include_image_descriptions
         self.api_wrapper = EnhancedTavilySearchAPIWrapper(api_key=api_key)
 
+    def _search_kwargs(self) -> Dict[str, Any]:
+        """同步/异步查询共用的搜索参数"""
+        return {
+            "max_results": self.max_results,
+            "search_depth": self.search_depth,
+            "include_domains": self.include_domains,
+            "exclude_domains": self.exclude_domains,
+            "include_answer": self.include_answer,
+            "include_raw_content": self.include_raw_content,
+            "include_images": self.include_images,
+            "include_image_descriptions": self.include_image_descriptions,
+        }
+
+    def _format_response(self, query: str, raw_results: Dict) -> str:
+        """清理原始搜索结果并序列化为 JSON
+
+        Args:
+            query: 搜索查询
+            raw_results: Tavily 返回的原始结果
+
+        Returns:
+            JSON 格式的搜索结果
+        """
+        cleaned_results = self.api_wrapper.clean_results_with_images(raw_results)
+
+        # 添加额外信息
+        response = {
+            "query": query,
+            "results": cleaned_results,
+            "response_time": raw_results.get("response_time"),
+        }
+
+        # 如果有答案，单独添加
+        if raw_results.get("answer"):
+            response["answer"] = raw_results["answer"]
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Tavily search results: %s", json_dumps(cleaned_results, indent=True))
+        return json_dumps(response)
+
     def _run(
         self,
         query: str,
@@ -117,42 +158,11 @@ class TavilySearchWithImages(BaseTool):
             JSON 格式的搜索结果
         """
         try:
-            raw_results = self.api_wrapper.raw_results(
-                query=query,
-                max_results=self.max_results,
-                search_depth=self.search_depth,
-                include_domains=self.include_domains,
-                exclude_domains=self.exclude_domains,
-                include_answer=self.include_answer,
-                include_raw_content=self.include_raw_content,
-                include_images=self.include_images,
-                include_image_descriptions=self.include_image_descriptions,
-            )
-
-            cleaned_results = self.api_wrapper.clean_results_with_images(raw_results)
-
-            # 添加额外信息
-            response = {
-                "query": query,
-                "results": cleaned_results,
-                "response_time": raw_results.get("response_time"),
-            }
-
-            # 如果有答案，单独添加
-            if raw_results.get("answer"):
-                response["answer"] = raw_results["answer"]
-
-            result_json = json.dumps(response, ensure_ascii=False)
-            logger.debug(
-                "Tavily search results: %s",
-                json.dumps(cleaned_results, indent=2, ensure_ascii=False)
-            )
-            return result_json
-
+            raw_results = self.api_wrapper.raw_results(query=query, **self._search_kwargs())
+            return self._format_response(query, raw_results)
         except Exception as e:
             logger.error("Tavily search error: %s", e, exc_info=True)
-            error_result = json.dumps({"error": str(e)}, ensure_ascii=False)
-            return error_result
+            return json_dumps({"error": str(e)})
 
     async def _arun(
         self,
@@ -167,37 +177,8 @@ class TavilySearchWithImages(BaseTool):
             JSON 格式的搜索结果
         """
         try:
-            raw_results = await self.api_wrapper.raw_results_async(
-                query=query,
-                max_results=self.max_results,
-                search_depth=self.search_depth,
-                include_domains=self.include_domains,
-                exclude_domains=self.exclude_domains,
-                include_answer=self.include_answer,
-                include_raw_content=self.include_raw_content,
-                include_images=self.include_images,
-                include_image_descriptions=self.include_image_descriptions,
-            )
-
-            cleaned_results = self.api_wrapper.clean_results_with_images(raw_results)
-
-            response = {
-                "query": query,
-                "results": cleaned_results,
-                "response_time": raw_results.get("response_time"),
-            }
-
-            if raw_results.get("answer"):
-                response["answer"] = raw_results["answer"]
-
-            result_json = json.dumps(response, ensure_ascii=False)
-            logger.debug(
-                "Tavily search async results: %s",
-                json.dumps(cleaned_results, indent=2, ensure_ascii=False)
-            )
-            return result_json
-
+            raw_results = await self.api_wrapper.raw_results_async(query=query, **self._search_kwargs())
+            return self._format_response(query, raw_results)
         except Exception as e:
             logger.error("Tavily search async error: %s", e, exc_info=True)
-            error_result = json.dumps({"error": str(e)}, ensure_ascii=False)
-            return error_result
+            return json_dumps({"error": str(e)})
@@ -2,61 +2,136 @@
 Testing and code quality assurance tools
 """
 
+import asyncio
+import glob
+import importlib.util
 import json
-import uuid
-import subprocess
+import math
+import sys
 import tempfile
 import os
+import xml.etree.ElementTree as ET
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Union
 from src.tools import BaseTool
+from src.tools.ids import new_id
+from src.tools.sandbox import PythonSandbox, SandboxConfig
+
+
+# Seconds before a pytest run is aborted
+_TEST_TIMEOUT = 600
+
+
+def _has_module(name: str) -> bool:
+    return importlib.util.find_spec(name) is not None
+
+
+def _pytest_command(file_pattern: str, workers: Union[int, str], dist: str, coverage: bool,
+                    junit_path: str, cov_path: str) -> List[str]:
+    """Build the pytest command line
+
+    Tests are spread over pytest-xdist workers when it is installed; with
+    coverage, pytest-cov merges the workers' data and records per-test contexts.
+    """
+    cmd = [sys.executable, "-m", "pytest", "-q", f"--junitxml={junit_path}"]
+
+    if not any(c in file_pattern for c in "*?["):
+        cmd.append(file_pattern)
+    elif os.sep in file_pattern or "/" in file_pattern:
+        cmd.extend(sorted(glob.glob(file_pattern, recursive=True)) or [file_pattern])
+    else:
+        # Bare file-name glob: select test modules by name during discovery
+        cmd += ["-o", f"python_files={file_pattern}"]
+
+    if str(workers) not in ("0", "1") and _has_module("xdist"):
+        cmd += ["-n", str(workers), f"--dist={dist}"]
+    if coverage and _has_module("pytest_cov"):
+        cmd += ["--cov", "--cov-context=test", f"--cov-report=json:{cov_path}"]
+    return cmd
+
+
+def _parse_junit(path: str) -> Dict[str, Any]:
+    """Sum test counts and duration over the suites of a JUnit XML report"""
+    root = ET.parse(path).getroot()
+    suites = [root] if root.tag == "testsuite" else root.iter("testsuite")
+    counts = {"tests": 0, "failures": 0, "errors": 0, "skipped": 0}
+    duration = 0.0
+    for suite in suites:
+        for key in counts:
+            counts[key] += int(suite.get(key, 0))
+        duration += float(suite.get("time", 0))
+    counts["time"] = round(duration, 3)
+    return counts
+
+
+def _parse_coverage(path: str) -> Dict[str, Any]:
+    """Extract totals from a coverage.py JSON report"""
+    with open(path, 'r', encoding='utf-8') as f:
+        totals = json.load(f).get("totals", {})
+    return {
+        "lines_covered": totals.get("covered_lines", 0),
+        "total_lines": totals.get("num_statements", 0),
+        "branches_covered": totals.get("covered_branches", 0),
+        "total_branches": totals.get("num_branches", 0),
+        "total_coverage": round(totals.get("percent_covered", 0.0), 2)
+    }
 
 
 class CodeExecutorTool(BaseTool):
     """Execute code in a controlled environment"""
 
-    def get_schema(self):
-        return {
-            "type": "function",
-            "function": {
-                "name": "run_code",
-                "description": "Execute code in a sandbox environment",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "code": {"type": "string", "description": "Code to execute"},
-                        "language": {"type": "string", "description": "Programming language"},
-                        "environment": {"type": "string", "description": "Execution environment"},
-                        "timeout": {"type": "number", "description": "Timeout in seconds"}
-                    },
-                    "required": ["code"]
-                }
+    _SCHEMA = {
+        "type": "function",
+        "function": {
+            "name": "run_code",
+            "description": "Execute code in a sandbox environment",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "code": {"type": "string", "description": "Code to execute"},
+                    "language": {"type": "string", "description": "Programming language"},
+                    "environment": {"type": "string", "description": "Execution environment"},
+                    "timeout": {"type": "number", "description": "Timeout in seconds"}
+                },
+                "required": ["code"]
             }
         }
+    }
+
+    def get_schema(self):
+        return self._SCHEMA
 
-    def execute(self, code: str, language: str = "python",
-                environment: str = "sandbox", timeout: int = 30) -> Dict[str, Any]:
+    async def execute(self, code: str, language: str = "python",
+                      environment: str = "sandbox", timeout: int = 30) -> Dict[str, Any]:
         """Execute code with timeout"""
-        execution_id = str(uuid.uuid4())
+        execution_id = new_id()
 
-        try:
-            # For now, simulate execution
-            # In a real implementation, this would use actual code execution
+        if language.lower() != "python":
             result = {
                 "execution_id": execution_id,
-                "status": "success",
-                "output": f"Code executed successfully (simulated)",
-                "error": None,
-                "execution_time": 0.5,
+                "status": "error",
+                "output": None,
+                "error": f"Unsupported language: {language}",
+                "execution_time": 0,
                 "environment": environment
             }
-        except Exception as e:
+        else:
+            # Each call gets its own sandbox directory so concurrent executions
+            # don't overwrite each other's main.py. The sandbox is used once, so run
+            # a one-shot process instead of starting its resident worker; the
+            # process is killed on timeout (whole seconds, rounded up)
+            sandbox = PythonSandbox(SandboxConfig(timeout=max(1, math.ceil(timeout))))
+            try:
+                execution = await sandbox.execute_code(code, command=[sys.executable, "main.py"])
+            finally:
+                sandbox.cleanup()
             result = {
                 "execution_id": execution_id,
-                "status": "error",
-                "output": None,
-                "error": str(e),
-                "execution_time": 0,
+                "status": "success" if execution.return_code == 0 else "error",
+                "output": execution.stdout,
+                "error": execution.stderr or None,
+                "return_code": execution.return_code,
+                "execution_time": round(execution.execution_time, 3),
                 "environment": environment
             }
 
@@ -70,29 +145,38 @@ class CodeExecutorTool(BaseTool):
 class TestRunnerTool(BaseTool):
     """Run various types of tests"""
 
-    def get_schema(self):
-        return {
-            "type": "function",
-            "function": {
-                "name": "execute_tests",
-                "description": "Execute tests with specified type",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "test_type": {"type": "string", "enum": ["unit", "integration", "e2e", "performance"], "description": "Type of tests"},
-                        "file_pattern": {"type": "string", "description": "File pattern for tests"},
-                        "test_framework": {"type": "string", "description": "Test framework to use"},
-                        "coverage": {"type": "boolean", "description": "Generate coverage report"}
-                    },
-                    "required": ["test_type"]
-                }
+    _SCHEMA = {
+        "type": "function",
+        "function": {
+            "name": "execute_tests",
+            "description": "Execute tests with specified type",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "test_type": {"type": "string", "enum": ["unit", "integration", "e2e", "performance"], "description": "Type of tests"},
+                    "file_pattern": {"type": "string", "description": "File pattern for tests"},
+                    "test_framework": {"type": "string", "description": "Test framework to use"},
+                    "coverage": {"type": "boolean", "description": "Generate coverage report"},
+                    "workers": {"type": ["integer", "string"], "description": "pytest-xdist worker count, or 'auto' for one per CPU (default: auto)"},
+                    "dist": {"type": "string", "enum": ["load", "loadfile", "loadscope", "worksteal"], "description": "pytest-xdist distribution mode; loadfile keeps each module on one worker (default: load)"}
+                },
+                "required": ["test_type"]
             }
         }
+    }
 
-    def execute(self, test_type: str, file_pattern: Optional[str] = None,
-                test_framework: Optional[str] = None, coverage: bool = False) -> Dict[str, Any]:
+    def get_schema(self):
+        return self._SCHEMA
+
+    async def execute(self, test_type: str, file_pattern: Optional[str] = None,
+                      test_framework: Optional[str] = None, coverage: bool = False,
+                      workers: Union[int, str] = "auto", dist: str = "load") -> Dict[str, Any]:
         """Execute tests"""
-        test_id = str(uuid.uuid4())
+        if (test_framework or "pytest") == "pytest":
+            return await self._run_pytest(test_type, file_pattern or f"*_{test_type}_test.py",
+                                          coverage, workers, dist)
+
+        test_id = new_id()
 
         # Simulate test execution
         test_results = {
@@ -123,32 +207,104 @@ class TestRunnerTool(BaseTool):
             "message": f"Executed {test_type} tests: {test_results['passed']}/{test_results['total_tests']} passed"
         }
 
+    async def _run_pytest(self, test_type: str, file_pattern: str, coverage: bool,
+                          workers: Union[int, str], dist: str) -> Dict[str, Any]:
+        """Run pytest and report the counts from its JUnit XML output
+
+        pytest runs in a subprocess awaited on the event loop, so a long test
+        run doesn't block other tool calls.
+        """
+        test_id = new_id()
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            junit_path = os.path.join(tmp_dir, "junit.xml")
+            cov_path = os.path.join(tmp_dir, "coverage.json")
+            cmd = _pytest_command(file_pattern, workers, dist, coverage, junit_path, cov_path)
+
+            proc = await asyncio.create_subprocess_exec(
+                *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=_TEST_TIMEOUT)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                return {
+                    "success": False,
+                    "error": f"Tests timed out after {_TEST_TIMEOUT} seconds",
+                    "test_id": test_id
+                }
+
+            stdout = stdout.decode('utf-8', errors='replace')
+            stderr = stderr.decode('utf-8', errors='replace')
+
+            # Exit code 5: no tests collected
+            if not os.path.exists(junit_path) or proc.returncode not in (0, 1, 5):
+                return {
+                    "success": False,
+                    "error": (stderr or stdout)[-2000:],
+                    "exit_code": proc.returncode,
+                    "test_id": test_id
+                }
+
+            counts = _parse_junit(junit_path)
+            failed = counts["failures"] + counts["errors"]
+            test_results = {
+                "test_id": test_id,
+                "test_type": test_type,
+                "file_pattern": file_pattern,
+                "test_framework": "pytest",
+                "total_tests": counts["tests"],
+                "passed": counts["tests"] - failed - counts["skipped"],
+                "failed": failed,
+                "skipped": counts["skipped"],
+                "coverage": coverage,
+                "execution_time": counts["time"],
+                "exit_code": proc.returncode,
+                "output": stdout[-2000:],
+                "executed_at": datetime.now().isoformat()
+            }
+
+            if coverage:
+                if os.path.exists(cov_path):
+                    test_results["coverage_report"] = _parse_coverage(cov_path)
+                else:
+                    test_results["coverage_report"] = {"error": "pytest-cov is not installed"}
+
+        return {
+            "success": True,
+            "test_results": test_results,
+            "message": f"Executed {test_type} tests: {test_results['passed']}/{test_results['total_tests']} passed"
+        }
+
 
 class QualityCheckTool(BaseTool):
     """Check code quality metrics"""
 
-    def get_schema(self):
-        return {
-            "type": "function",
-            "function": {
-                "name": "check_quality",
-                "description": "Perform code quality checks",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "code_file": {"type": "string", "description": "Code file to check"},
-                        "check_type": {"type": "string", "enum": ["style", "security", "complexity", "all"], "description": "Type of quality check"},
-                        "standards": {"type": "string", "description": "Coding standards to apply"}
-                    },
-                    "required": ["code_file", "check_type"]
-                }
+    _SCHEMA = {
+        "type": "function",
+        "function": {
+            "name": "check_quality",
+            "description": "Perform code quality checks",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "code_file": {"type": "string", "description": "Code file to check"},
+                    "check_type": {"type": "string", "enum": ["style", "security", "complexity", "all"], "description": "Type of quality check"},
+                    "standards": {"type": "string", "description": "Coding standards to apply"}
+                },
+                "required": ["code_file", "check_type"]
             }
         }
+    }
+
+    def get_schema(self):
+        return self._SCHEMA
 
     def execute(self, code_file: str, check_type: str,
                 standards: Optional[str] = None) -> Dict[str, Any]:
         """Execute quality check"""
-        check_id = str(uuid.uuid4())
+        check_id = new_id()
 
         # Simulate quality checks
         quality_metrics = {
@@ -206,30 +362,32 @@ class QualityCheckTool(BaseTool):
 class TestSuiteTool(BaseTool):
     """Create and manage test suites"""
 
-    def get_schema(self):
-        return {
-            "type": "function",
-            "function": {
-                "name": "create_test_suite",
-                "description": "Create a test suite",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "tests": {"type": "array", "items": {"type": "object"}, "description": "List of test cases"},
-                        "framework": {"type": "string", "description": "Test framework"},
-                        "suite_name": {"type": "string", "description": "Test suite name"},
-                        "setup_code": {"type": "string", "description": "Setup code for tests"}
-                    },
-                    "required": ["tests", "framework"]
-                }
+    _SCHEMA = {
+        "type": "function",
+        "function": {
+            "name": "create_test_suite",
+            "description": "Create a test suite",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "tests": {"type": "array", "items": {"type": "object"}, "description": "List of test cases"},
+                    "framework": {"type": "string", "description": "Test framework"},
+                    "suite_name": {"type": "string", "description": "Test suite name"},
+                    "setup_code": {"type": "string", "description": "Setup code for tests"}
+                },
+                "required": ["tests", "framework"]
             }
         }
+    }
+
+    def get_schema(self):
+        return self._SCHEMA
 
     def execute(self, tests: List[Dict], framework: str,
                 suite_name: Optional[str] = None,
                 setup_code: Optional[str] = None) -> Dict[str, Any]:
         """Create test suite"""
-        suite_id = str(uuid.uuid4())
+        suite_id = new_id()
 
         test_suite = {
             "id": suite_id,
@@ -251,34 +409,38 @@ class TestSuiteTool(BaseTool):
 class GenerateTestReportTool(BaseTool):
     """Generate comprehensive test reports"""
 
-    def get_schema(self):
-        return {
-            "type": "function",
-            "function": {
-                "name": "generate_test_report",
-                "description": "Generate a comprehensive test report",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "test_results": {"type": "array", "items": {"type": "object"}, "description": "Test results data"},
-                        "report_format": {"type": "string", "enum": ["json", "html", "markdown"], "description": "Report format"},
-                        "include_charts": {"type": "boolean", "description": "Include charts in report"}
-                    },
-                    "required": ["test_results"]
-                }
+    _SCHEMA = {
+        "type": "function",
+        "function": {
+            "name": "generate_test_report",
+            "description": "Generate a comprehensive test report",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "test_results": {"type": "array", "items": {"type": "object"}, "description": "Test results data"},
+                    "report_format": {"type": "string", "enum": ["json", "html", "markdown"], "description": "Report format"},
+                    "include_charts": {"type": "boolean", "description": "Include charts in report"}
+                },
+                "required": ["test_results"]
             }
         }
+    }
+
+    def get_schema(self):
+        return self._SCHEMA
 
     def execute(self, test_results: List[Dict],
                 report_format: str = "markdown",
                 include_charts: bool = True) -> Dict[str, Any]:
         """Generate test report"""
-        report_id = str(uuid.uuid4())
+        report_id = new_id()
 
-        # Aggregate test results
-        total_tests = sum(r.get("total_tests", 0) for r in test_results)
-        total_passed = sum(r.get("passed", 0) for r in test_results)
-        total_failed = sum(r.get("failed", 0) for r in test_results)
+        # Aggregate test results in one pass
+        total_tests = total_passed = total_failed = 0
+        for r in test_results:
+            total_tests += r.get("total_tests", 0)
+            total_passed += r.get("passed", 0)
+            total_failed += r.get("failed", 0)
 
         report = {
             "id": report_id,
@@ -315,28 +477,30 @@ class GenerateTestReportTool(BaseTool):
 class CreateTestFileTool(BaseTool):
     """Create test files with templates"""
 
-    def get_schema(self):
-        return {
-            "type": "function",
-            "function": {
-                "name": "create_test_file",
-                "description": "Create a test file with test cases",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "test_file": {"type": "string", "description": "Path to test file"},
-                        "test_cases": {"type": "array", "items": {"type": "object"}, "description": "Test cases to include"},
-                        "template": {"type": "string", "description": "Test template to use"}
-                    },
-                    "required": ["test_file", "test_cases"]
-                }
+    _SCHEMA = {
+        "type": "function",
+        "function": {
+            "name": "create_test_file",
+            "description": "Create a test file with test cases",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "test_file": {"type": "string", "description": "Path to test file"},
+                    "test_cases": {"type": "array", "items": {"type": "object"}, "description": "Test cases to include"},
+                    "template": {"type": "string", "description": "Test template to use"}
+                },
+                "required": ["test_file", "test_cases"]
             }
         }
+    }
+
+    def get_schema(self):
+        return self._SCHEMA
 
     def execute(self, test_file: str, test_cases: List[Dict],
                 template: Optional[str] = None) -> Dict[str, Any]:
         """Create test file"""
-        file_id = str(uuid.uuid4())
+        file_id = new_id()
 
         test_file_content = self._generate_test_content(test_cases, template)
 
@@ -358,12 +522,10 @@ class CreateTestFileTool(BaseTool):
 
     def _generate_test_content(self, test_cases: List[Dict], template: str) -> str:
         """Generate test file content"""
-        content = ["# Test File Generated Automatically", ""]
-
-        for i, test_case in enumerate(test_cases):
-            content.append(f"def test_{test_case.get('name', f'test_{i}')}():")
-            content.append(f"    # {test_case.get('description', 'Test description')}")
-            content.append("    pass")
-            content.append("")
-
-        return "\n".join(content)
\ No newline at end of file
+        # One string per test case; the default name is only formatted when missing
+        return "# Test File Generated Automatically\n" + "".join([
+            f"\ndef test_{test_case['name'] if 'name' in test_case else f'test_{i}'}():\n"
+            f"    # {test_case.get('description', 'Test description')}\n"
+            "    pass\n"
+            for i, test_case in enumerate(test_cases)
+        ])
\ No newline at end of file
@@ -2,37 +2,32 @@
 Todo list management tools for code coordination
 """
 
-import json
 import os
 from typing import Any, Dict, List, Optional
 from datetime import datetime
-from dataclasses import dataclass, field
-
-
-@dataclass
-class TodoItem:
-    """Todo item structure"""
-    id: str
-    title: str
-    description: str
-    status: str = "pending"  # pending, in_progress, completed, blocked
-    priority: str = "normal"  # low, normal, high, critical
-    assignee: Optional[str] = None
-    files: List[str] = field(default_factory=list)
-    dependencies: List[str] = field(default_factory=list)
-    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
-    updated_at: str = field(default_factory=lambda: datetime.now().isoformat())
-
-
-@dataclass
-class TodoList:
-    """Todo list structure"""
-    id: str
-    title: str
-    description: str
-    items: List[TodoItem] = field(default_factory=list)
-    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
-    updated_at: str = field(default_factory=lambda: datetime.now().isoformat())
+
+from ..json_utils import dumps_bytes as json_dumps_bytes, loads as json_loads
+
+
+_PRIORITY_SYMBOLS = {"low": "↓", "normal": "○", "high": "↑", "critical": "!"}
+
+
+def _write_todo_file(filename: str, data: Dict[str, Any]) -> None:
+    """Atomically replace filename with data serialized as indented JSON
+
+    The JSON is written to a temporary file in the same directory and renamed
+    over the target, so readers never see a partially written list.
+    """
+    # Unique name per write; os.open keeps the usual umask-based permissions
+    tmp_path = f"{filename}.{os.urandom(8).hex()}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(json_dumps_bytes(data, indent=True))
+        os.replace(tmp_path, filename)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
 
 
 class CreateTodoListTool:
@@ -41,45 +36,47 @@ class CreateTodoListTool:
     name = "create_todo_list"
     description = "Create a structured todo list for code implementation"
 
-    @staticmethod
-    def get_schema() -> Dict[str, Any]:
-        """Get the tool schema"""
-        return {
-            "type": "function",
-            "function": {
-                "name": CreateTodoListTool.name,
-                "description": CreateTodoListTool.description,
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "title": {
-                            "type": "string",
-                            "description": "Title of the todo list"
-                        },
-                        "description": {
-                            "type": "string",
-                            "description": "Description of the todo list"
-                        },
+    _SCHEMA = {
+        "type": "function",
+        "function": {
+            "name": name,
+            "description": description,
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "title": {
+                        "type": "string",
+                        "description": "Title of the todo list"
+                    },
+                    "description": {
+                        "type": "string",
+                        "description": "Description of the todo list"
+                    },
+                    "items": {
+                        "type": "array",
+                        "description": "List of todo items",
                         "items": {
-                            "type": "array",
-                            "description": "List of todo items",
-                            "items": {
-                                "type": "object",
-                                "properties": {
-                                    "title": {"type": "string"},
-                                    "description": {"type": "string"},
-                                    "priority": {"type": "string", "enum": ["low", "normal", "high", "critical"]},
-                                    "files": {"type": "array", "items": {"type": "string"}},
-                                    "dependencies": {"type": "array", "items": {"type": "string"}}
-                                },
-                                "required": ["title", "description"]
-                            }
+                            "type": "object",
+                            "properties": {
+                                "title": {"type": "string"},
+                                "description": {"type": "string"},
+                                "priority": {"type": "string", "enum": ["low", "normal", "high", "critical"]},
+                                "files": {"type": "array", "items": {"type": "string"}},
+                                "dependencies": {"type": "array", "items": {"type": "string"}}
+                            },
+                            "required": ["title", "description"]
                         }
-                    },
-                    "required": ["title", "description", "items"]
-                }
+                    }
+                },
+                "required": ["title", "description", "items"]
             }
         }
+    }
+
+    @classmethod
+    def get_schema(cls) -> Dict[str, Any]:
+        """Get the tool schema"""
+        return cls._SCHEMA
 
     @staticmethod
     async def execute(
@@ -89,54 +86,40 @@ class CreateTodoListTool:
     ) -> Dict[str, Any]:
         """Execute the tool"""
         try:
-            # Create todo list
-            todo_list = TodoList(
-                id=f"todo_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
-                title=title,
-                description=description
-            )
-
-            # Add items
-            for i, item_data in enumerate(items):
-                todo_item = TodoItem(
-                    id=f"item_{i+1}",
-                    title=item_data.get("title", ""),
-                    description=item_data.get("description", ""),
-                    priority=item_data.get("priority", "normal"),
-                    files=item_data.get("files", []),
-                    dependencies=item_data.get("dependencies", [])
-                )
-                todo_list.items.append(todo_item)
+            todo_list_id = f"todo_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            now = datetime.now().isoformat()
+
+            # Build the persisted item records directly from the input
+            todo_items = [
+                {
+                    "id": f"item_{i}",
+                    "title": item_data.get("title", ""),
+                    "description": item_data.get("description", ""),
+                    "status": "pending",  # pending, in_progress, completed, blocked
+                    "priority": item_data.get("priority", "normal"),  # low, normal, high, critical
+                    "files": item_data.get("files", []),
+                    "dependencies": item_data.get("dependencies", []),
+                    "created_at": now,
+                    "updated_at": now
+                }
+                for i, item_data in enumerate(items, 1)
+            ]
 
             # Save to file
             os.makedirs("todo_lists", exist_ok=True)
-            filename = f"todo_lists/{todo_list.id}.json"
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump({
-                    "id": todo_list.id,
-                    "title": todo_list.title,
-                    "description": todo_list.description,
-                    "items": [
-                        {
-                            "id": item.id,
-                            "title": item.title,
-                            "description": item.description,
-                            "status": item.status,
-                            "priority": item.priority,
-                            "files": item.files,
-                            "dependencies": item.dependencies,
-                            "created_at": item.created_at,
-                            "updated_at": item.updated_at
-                        }
-                        for item in todo_list.items
-                    ],
-                    "created_at": todo_list.created_at,
-                    "updated_at": todo_list.updated_at
-                }, f, indent=2, ensure_ascii=False)
+            filename = f"todo_lists/{todo_list_id}.json"
+            _write_todo_file(filename, {
+                "id": todo_list_id,
+                "title": title,
+                "description": description,
+                "items": todo_items,
+                "created_at": now,
+                "updated_at": now
+            })
 
             return {
                 "success": True,
-                "todo_list_id": todo_list.id,
+                "todo_list_id": todo_list_id,
                 "title": title,
                 "items_count": len(items),
                 "file": filename
@@ -154,39 +137,41 @@ class UpdateTodoTool:
     name = "update_todo"
     description = "Update status of a todo item"
 
-    @staticmethod
-    def get_schema() -> Dict[str, Any]:
-        """Get the tool schema"""
-        return {
-            "type": "function",
-            "function": {
-                "name": UpdateTodoTool.name,
-                "description": UpdateTodoTool.description,
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "todo_list_id": {
-                            "type": "string",
-                            "description": "ID of the todo list"
-                        },
-                        "item_id": {
-                            "type": "string",
-                            "description": "ID of the todo item"
-                        },
-                        "status": {
-                            "type": "string",
-                            "enum": ["pending", "in_progress", "completed", "blocked"],
-                            "description": "New status for the item"
-                        },
-                        "notes": {
-                            "type": "string",
-                            "description": "Optional notes about the update"
-                        }
+    _SCHEMA = {
+        "type": "function",
+        "function": {
+            "name": name,
+            "description": description,
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "todo_list_id": {
+                        "type": "string",
+                        "description": "ID of the todo list"
                     },
-                    "required": ["todo_list_id", "item_id", "status"]
-                }
+                    "item_id": {
+                        "type": "string",
+                        "description": "ID of the todo item"
+                    },
+                    "status": {
+                        "type": "string",
+                        "enum": ["pending", "in_progress", "completed", "blocked"],
+                        "description": "New status for the item"
+                    },
+                    "notes": {
+                        "type": "string",
+                        "description": "Optional notes about the update"
+                    }
+                },
+                "required": ["todo_list_id", "item_id", "status"]
             }
         }
+    }
+
+    @classmethod
+    def get_schema(cls) -> Dict[str, Any]:
+        """Get the tool schema"""
+        return cls._SCHEMA
 
     @staticmethod
     async def execute(
@@ -199,15 +184,16 @@ class UpdateTodoTool:
         try:
             # Load todo list
             filename = f"todo_lists/{todo_list_id}.json"
-            with open(filename, 'r', encoding='utf-8') as f:
-                todo_data = json.load(f)
+            with open(filename, 'rb') as f:
+                todo_data = json_loads(f.read())
 
             # Find and update item
+            now = datetime.now().isoformat()
             updated = False
             for item in todo_data["items"]:
                 if item["id"] == item_id:
                     item["status"] = status
-                    item["updated_at"] = datetime.now().isoformat()
+                    item["updated_at"] = now
                     if notes:
                         item["notes"] = notes
                     updated = True
@@ -220,9 +206,8 @@ class UpdateTodoTool:
                 }
 
             # Save updated list
-            todo_data["updated_at"] = datetime.now().isoformat()
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(todo_data, f, indent=2, ensure_ascii=False)
+            todo_data["updated_at"] = now
+            _write_todo_file(filename, todo_data)
 
             return {
                 "success": True,
@@ -248,32 +233,34 @@ class GetTodoListTool:
     name = "get_todo_list"
     description = "Get current status of a todo list"
 
-    @staticmethod
-    def get_schema() -> Dict[str, Any]:
-        """Get the tool schema"""
-        return {
-            "type": "function",
-            "function": {
-                "name": GetTodoListTool.name,
-                "description": GetTodoListTool.description,
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "todo_list_id": {
-                            "type": "string",
-                            "description": "ID of the todo list"
-                        },
-                        "filter": {
-                            "type": "string",
-                            "enum": ["all", "pending", "in_progress", "completed", "blocked"],
-                            "description": "Filter items by status (default: all)",
-                            "default": "all"
-                        }
+    _SCHEMA = {
+        "type": "function",
+        "function": {
+            "name": name,
+            "description": description,
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "todo_list_id": {
+                        "type": "string",
+                        "description": "ID of the todo list"
                     },
-                    "required": ["todo_list_id"]
-                }
+                    "filter": {
+                        "type": "string",
+                        "enum": ["all", "pending", "in_progress", "completed", "blocked"],
+                        "description": "Filter items by status (default: all)",
+                        "default": "all"
+                    }
+                },
+                "required": ["todo_list_id"]
             }
         }
+    }
+
+    @classmethod
+    def get_schema(cls) -> Dict[str, Any]:
+        """Get the tool schema"""
+        return cls._SCHEMA
 
     @staticmethod
     async def execute(
@@ -284,34 +271,34 @@ class GetTodoListTool:
         try:
             # Load todo list
             filename = f"todo_lists/{todo_list_id}.json"
-            with open(filename, 'r', encoding='utf-8') as f:
-                todo_data = json.load(f)
-
-            # Filter items if needed
-            items = todo_data["items"]
-            if filter != "all":
-                items = [item for item in items if item["status"] == filter]
+            with open(filename, 'rb') as f:
+                todo_data = json_loads(f.read())
 
-            # Count statuses
+            # Count statuses and filter items in a single pass
+            all_items = todo_data["items"]
+            items = all_items if filter == "all" else []
             status_counts = {}
-            for item in todo_data["items"]:
+            for item in all_items:
                 status = item["status"]
                 status_counts[status] = status_counts.get(status, 0) + 1
+                if status == filter:
+                    items.append(item)
 
             # Generate summary
-            summary = f"""
-Todo List: {todo_data['title']}
-Total items: {len(todo_data['items'])}
-Status: {status_counts}
-"""
+            parts = [
+                f"Todo List: {todo_data['title']}\n"
+                f"Total items: {len(todo_data['items'])}\n"
+                f"Status: {status_counts}"
+            ]
 
             if items:
-                summary += "\n\nItems:\n"
+                parts.append("\n\n\nItems:\n")
                 for item in items:
-                    priority_symbol = {"low": "↓", "normal": "○", "high": "↑", "critical": "!"}[item.get("priority", "normal")]
-                    summary += f"\n{priority_symbol} [{item['status'].upper()}] {item['title']}"
+                    priority_symbol = _PRIORITY_SYMBOLS[item.get("priority", "normal")]
+                    parts.append(f"\n{priority_symbol} [{item['status'].upper()}] {item['title']}")
                     if item.get("files"):
-                        summary += f" (Files: {', '.join(item['files'])})"
+                        parts.append(f" (Files: {', '.join(item['files'])})")
+            summary = "".join(parts)
 
             return {
                 "success": True,
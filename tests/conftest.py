@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# 与 main.py 一样把项目根目录加入导入路径，`pytest tests/` 时可以导入 src
+sys.path.insert(0, str(Path(__file__).parent.parent))
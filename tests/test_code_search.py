@@ -0,0 +1,67 @@
+"""
+code_search 匹配路径与逐行 re 搜索的一致性测试
+"""
+
+import re
+
+import pytest
+
+from src.tools.search_tools_dir import search_tools
+
+CONTENTS = [
+    b"",
+    b"\n",
+    b"def foo():\n    return Foo\n\nclass FOO:\n    pass",
+    b"alpha beta\nBETA gamma\n\n",
+    b"crlf line\r\nfoo\rbar\r\n",
+    "café foo\nKelvin K\nſkip".encode("utf-8"),
+    b"fo\xffo foo\nf\xc3oo\n",
+]
+
+# 整个文件一次匹配的模式（字面量、普通正则）以及需要逐行匹配的模式
+LINE_LOCAL = ["foo", "beta", "k", "s", "", "def foo", "fo+", "^$", "a|^b", "o$", ".", "x*"]
+PER_LINE = [r"\bfoo", r"[^a]", r"\s", r"(?s).", r"\Afoo", r"foo(?=\()", "[k]"]
+
+
+def per_line_matches(path, pattern):
+    """原实现：文本模式读取，逐行 re 搜索"""
+    regex = re.compile(pattern, re.IGNORECASE)
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        lines = f.read().split("\n")
+    return [
+        {"line": i, "content": line.strip()}
+        for i, line in enumerate(lines, 1)
+        if next(regex.finditer(line), None) is not None
+    ]
+
+
+@pytest.fixture(params=range(len(CONTENTS)))
+def source_file(request, tmp_path):
+    path = tmp_path / "sample.py"
+    path.write_bytes(CONTENTS[request.param])
+    return str(path)
+
+
+@pytest.mark.parametrize("pattern", LINE_LOCAL + PER_LINE)
+def test_matches_per_line_search(source_file, pattern):
+    assert search_tools._scan_file(source_file, pattern) == per_line_matches(source_file, pattern)
+
+
+@pytest.mark.parametrize("pattern", LINE_LOCAL)
+def test_bytes_regex_without_hyperscan(source_file, pattern, monkeypatch):
+    monkeypatch.setattr(search_tools, "_compile_hyperscan", lambda pattern: None)
+    assert search_tools._scan_file(source_file, pattern) == per_line_matches(source_file, pattern)
+
+
+@pytest.mark.parametrize("pattern", ["fo+", "def foo", "o$", "a|^b"])
+def test_hyperscan(source_file, pattern):
+    pytest.importorskip("hyperscan")
+    assert search_tools._compile_hyperscan(pattern) is not None
+    assert search_tools._scan_file(source_file, pattern) == per_line_matches(source_file, pattern)
+
+
+def test_only_line_local_patterns_run_over_whole_files():
+    for pattern in LINE_LOCAL:
+        assert search_tools._compile_code_pattern(pattern)[1] is not None
+    for pattern in PER_LINE:
+        assert search_tools._compile_code_pattern(pattern)[1] is None
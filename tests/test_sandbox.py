@@ -0,0 +1,44 @@
+"""
+PythonSandbox 回归测试
+"""
+
+import asyncio
+import sys
+
+import pytest
+
+from src.tools.sandbox import PythonSandbox, SandboxConfig
+
+
+@pytest.fixture
+def sandbox():
+    box = PythonSandbox(SandboxConfig(timeout=10))
+    yield box
+    box.cleanup()
+
+
+def test_waits_for_non_daemon_threads(sandbox):
+    code = (
+        "import threading, time\n"
+        "def work():\n"
+        "    time.sleep(0.2)\n"
+        "    print('from thread')\n"
+        "threading.Thread(target=work).start()\n"
+        "print('from main')\n"
+    )
+    result = asyncio.run(sandbox.execute_code(code))
+    assert result.return_code == 0
+    assert result.stdout.splitlines() == ["from main", "from thread"]
+
+
+def test_matches_standalone_run(sandbox):
+    code = (
+        "import threading, atexit\n"
+        "atexit.register(lambda: print('at exit'))\n"
+        "threading.Thread(target=print, args=('from thread',)).start()\n"
+        "raise SystemExit(3)\n"
+    )
+    pooled = asyncio.run(sandbox.execute_code(code))
+    standalone = asyncio.run(sandbox.execute_code(code, command=[sys.executable, "main.py"]))
+    assert pooled.return_code == standalone.return_code == 3
+    assert pooled.stdout == standalone.stdout